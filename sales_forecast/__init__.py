@@ -0,0 +1,10 @@
+"""Librería de análisis y predicción de ventas de Funny Kitchen."""
+
+from .backtest import leaderboard, run_backtest
+from .columnar import ColumnarHistory, compact_history
+from .features import FEATURES, add_calendar_columns, add_features
+from .forecast import SalesForecaster
+from .fx import RateTable
+from .ingestion import DAILY_COLUMNS, DailySalesStore, read_export_chunks
+from .pipeline import load_history, train_models
+from .telemetry import RunTelemetry
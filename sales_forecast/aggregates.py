@@ -0,0 +1,344 @@
+import json
+import math
+import os
+
+import pandas as pd
+
+DEFAULT_RELATIVE_ACCURACY = 0.005
+
+
+class QuantileSketch:
+    """Sketch de cuantiles con error relativo acotado (estilo DDSketch) para valores no negativos.
+
+    Los valores se cuentan en cubetas logarítmicas, por lo que agregar, quitar y
+    combinar sketches es O(1) por valor / O(cubetas) y el resultado no depende del
+    orden en que llegaron los datos.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _bucket(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value, weight=1):
+        if value <= 0:
+            self.zero_count += weight
+        else:
+            key = self._bucket(value)
+            self.buckets[key] = self.buckets.get(key, 0) + weight
+            if self.buckets[key] == 0:
+                del self.buckets[key]
+        self.count += weight
+
+    def remove(self, value):
+        self.add(value, weight=-1)
+
+    def merge(self, other):
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if self.count <= 0:
+            return float('nan')
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'buckets': {str(k): n for k, n in self.buckets.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'])
+        sketch.buckets = {int(k): n for k, n in data['buckets'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        return sketch
+
+
+class _Group:
+    """Sumas y conteos acumulados de un grupo (un año-mes o un día de la semana)."""
+
+    def __init__(self, relative_accuracy):
+        self.ventas = 0.0
+        self.cotizaciones = 0
+        self.dias = 0
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, old, new):
+        """Reemplaza la contribución de un día: `old`/`new` son (cotizaciones, ventas) o None."""
+        if old is not None:
+            self.cotizaciones -= old[0]
+            self.ventas -= old[1]
+            self.dias -= 1
+            self.sketch.remove(old[1])
+        if new is not None:
+            self.cotizaciones += new[0]
+            self.ventas += new[1]
+            self.dias += 1
+            self.sketch.add(new[1])
+
+    def to_dict(self):
+        return {'ventas': self.ventas, 'cotizaciones': self.cotizaciones, 'dias': self.dias, 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        group = cls(data['sketch']['relative_accuracy'])
+        group.ventas, group.cotizaciones, group.dias = data['ventas'], data['cotizaciones'], data['dias']
+        group.sketch = QuantileSketch.from_dict(data['sketch'])
+        return group
+
+
+class SalesAggregates:
+    """Estado incremental de los reportes de ventas.
+
+    Mantiene sumas acumuladas por día (prefijos, para consultas O(1) de cualquier
+    rango de fechas), totales por año-mes y por día de la semana, y un sketch de
+    cuantiles por grupo. Agregar un día nuevo es O(1); una corrección de un día ya
+    registrado sólo recorre los días posteriores a él.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.origin = None
+        # cum_*[i] = suma de los días [origin, origin + i)
+        self.cum_ventas = [0.0]
+        self.cum_cotizaciones = [0]
+        self.cum_dias = [0]
+        self.months = {}
+        self.weekdays = [_Group(relative_accuracy) for _ in range(7)]
+        self.total = _Group(relative_accuracy)
+        self.version = None
+
+    # --- actualización -------------------------------------------------------
+
+    def _index(self, fecha):
+        return (fecha - self.origin).days
+
+    def _day(self, idx):
+        if idx < 0 or idx + 1 >= len(self.cum_dias) or self.cum_dias[idx + 1] == self.cum_dias[idx]:
+            return None
+        return (self.cum_cotizaciones[idx + 1] - self.cum_cotizaciones[idx],
+                self.cum_ventas[idx + 1] - self.cum_ventas[idx])
+
+    def add_day(self, fecha, cotizaciones, ventas):
+        """Suma las cotizaciones y ventas de `fecha` (un día nuevo o un incremento de uno existente)."""
+        fecha = pd.Timestamp(fecha).normalize()
+        if self.origin is None:
+            self.origin = fecha
+        idx = self._index(fecha)
+        if idx < 0:
+            raise ValueError(f"{fecha.date()} es anterior al origen del estado ({self.origin.date()}); reconstruir con from_history")
+
+        # Rellenar días sin ventas hasta la fecha
+        while len(self.cum_dias) <= idx + 1:
+            self.cum_ventas.append(self.cum_ventas[-1])
+            self.cum_cotizaciones.append(self.cum_cotizaciones[-1])
+            self.cum_dias.append(self.cum_dias[-1])
+
+        old = self._day(idx)
+        new = (int(cotizaciones) + (old[0] if old else 0), float(ventas) + (old[1] if old else 0.0))
+        for i in range(idx + 1, len(self.cum_dias)):
+            self.cum_cotizaciones[i] += new[0] - (old[0] if old else 0)
+            self.cum_ventas[i] += new[1] - (old[1] if old else 0.0)
+            if old is None:
+                self.cum_dias[i] += 1
+
+        month_key = f'{fecha.year:04d}-{fecha.month:02d}'
+        if month_key not in self.months:
+            self.months[month_key] = _Group(self.relative_accuracy)
+        self.months[month_key].update(old, new)
+        self.weekdays[(fecha.dayofweek + 1) % 7].update(old, new)
+        self.total.update(old, new)
+
+    def add_days(self, daily):
+        """Aplica un DataFrame con `fecha`, `cotizaciones_por_dia` y `ventas_totales_mxn`."""
+        for fecha, cotizaciones, ventas in zip(daily['fecha'], daily['cotizaciones_por_dia'], daily['ventas_totales_mxn']):
+            self.add_day(fecha, cotizaciones, ventas)
+
+    @classmethod
+    def from_history(cls, daily, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        state = cls(relative_accuracy)
+        state.add_days(daily.sort_values('fecha'))
+        return state
+
+    # --- consultas -----------------------------------------------------------
+
+    def _bounds(self, start=None, end=None):
+        """Índices [lo, hi) de prefijo para el rango de fechas inclusivo [start, end]."""
+        n_days = len(self.cum_dias) - 1
+        lo = 0 if start is None else min(max(self._index(pd.Timestamp(start)), 0), n_days)
+        hi = n_days if end is None else min(max(self._index(pd.Timestamp(end)) + 1, 0), n_days)
+        return lo, max(lo, hi)
+
+    def range_summary(self, start=None, end=None):
+        """Totales y promedios de cualquier rango de fechas sin recorrer la historia."""
+        if self.origin is None:
+            return {'dias': 0, 'cotizaciones': 0, 'ventas': 0.0, 'promedio': float('nan')}
+        lo, hi = self._bounds(start, end)
+        dias = self.cum_dias[hi] - self.cum_dias[lo]
+        ventas = self.cum_ventas[hi] - self.cum_ventas[lo]
+        return {
+            'dias': dias,
+            'cotizaciones': self.cum_cotizaciones[hi] - self.cum_cotizaciones[lo],
+            'ventas': ventas,
+            'promedio': ventas / dias if dias else float('nan'),
+        }
+
+    def quantile(self, q, start=None, end=None):
+        """Cuantil aproximado de las ventas diarias en el rango (combinando sketches mensuales)."""
+        if self.origin is None:
+            return float('nan')
+        if start is None and end is None:
+            return self.total.sketch.quantile(q)
+        lo, hi = self._bounds(start, end)
+        sketch = QuantileSketch(self.relative_accuracy)
+        idx = lo
+        while idx < hi:
+            fecha = self.origin + pd.Timedelta(days=idx)
+            month_start = idx - (fecha.day - 1)
+            month_end = month_start + fecha.days_in_month
+            if idx == month_start and month_end <= hi:
+                # Mes completo dentro del rango: se usa su sketch
+                group = self.months.get(f'{fecha.year:04d}-{fecha.month:02d}')
+                if group is not None:
+                    sketch.merge(group.sketch)
+                idx = month_end
+                continue
+            # Días sueltos en las orillas del rango: su valor sale de los prefijos
+            day = self._day(idx)
+            if day is not None:
+                sketch.add(day[1])
+            idx += 1
+        return sketch.quantile(q)
+
+    def day(self, fecha):
+        """(cotizaciones, ventas) de una fecha, o None si no hubo ventas."""
+        if self.origin is None:
+            return None
+        return self._day(self._index(pd.Timestamp(fecha).normalize()))
+
+    def monthly_report(self):
+        rows = [
+            {'anio': int(key[:4]), 'mes': int(key[5:]), 'ventas': g.ventas,
+             'promedio': g.ventas / g.dias, 'dias': g.dias, 'cotizaciones': g.cotizaciones,
+             'mediana': g.sketch.quantile(0.5)}
+            for key, g in sorted(self.months.items()) if g.dias
+        ]
+        return pd.DataFrame(rows, columns=['anio', 'mes', 'ventas', 'promedio', 'dias', 'cotizaciones', 'mediana'])
+
+    def month_of_year_summary(self, mes):
+        """Totales de un mes del año sumando todos los años (p. ej. todos los marzos)."""
+        groups = [g for key, g in self.months.items() if int(key[5:]) == mes]
+        dias = sum(g.dias for g in groups)
+        ventas = sum(g.ventas for g in groups)
+        return {
+            'dias': dias,
+            'cotizaciones': sum(g.cotizaciones for g in groups),
+            'ventas': ventas,
+            'promedio': ventas / dias if dias else float('nan'),
+        }
+
+    def weekday_report(self):
+        rows = [
+            {'dia_semana': i, 'promedio': g.ventas / g.dias, 'dias': g.dias,
+             'cotizaciones_promedio': g.cotizaciones / g.dias, 'mediana': g.sketch.quantile(0.5)}
+            for i, g in enumerate(self.weekdays) if g.dias
+        ]
+        return pd.DataFrame(rows, columns=['dia_semana', 'promedio', 'dias', 'cotizaciones_promedio', 'mediana'])
+
+    @property
+    def first_date(self):
+        return self.origin
+
+    @property
+    def last_date(self):
+        if self.origin is None:
+            return None
+        return self.origin + pd.Timedelta(days=len(self.cum_dias) - 2)
+
+    # --- persistencia --------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'origin': None if self.origin is None else self.origin.strftime('%Y-%m-%d'),
+            'cum_ventas': self.cum_ventas,
+            'cum_cotizaciones': self.cum_cotizaciones,
+            'cum_dias': self.cum_dias,
+            'months': {key: g.to_dict() for key, g in self.months.items()},
+            'weekdays': [g.to_dict() for g in self.weekdays],
+            'total': self.total.to_dict(),
+            'version': self.version,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data['relative_accuracy'])
+        state.origin = None if data['origin'] is None else pd.Timestamp(data['origin'])
+        state.cum_ventas = data['cum_ventas']
+        state.cum_cotizaciones = data['cum_cotizaciones']
+        state.cum_dias = data['cum_dias']
+        state.months = {key: _Group.from_dict(g) for key, g in data['months'].items()}
+        state.weekdays = [_Group.from_dict(g) for g in data['weekdays']]
+        state.total = _Group.from_dict(data['total'])
+        state.version = data['version']
+        return state
+
+    def save(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def sync(cls, path, history, version, deltas=None, base_version=None):
+        """Carga el estado persistido y lo pone al día con la menor cantidad de trabajo.
+
+        - Si el estado ya corresponde a `version`, se usa tal cual.
+        - Si corresponde a `base_version` y hay `deltas` (los totales diarios de las
+          filas recién ingeridas), se aplican sólo esos días.
+        - En cualquier otro caso se reconstruye desde `history`.
+        """
+        state = cls.load(path)
+        if state is not None and state.version == version:
+            return state
+        if state is not None and deltas is not None and state.version == base_version:
+            try:
+                state.add_days(deltas)
+            except ValueError:
+                state = None
+        else:
+            state = None
+        if state is None:
+            state = cls.from_history(history)
+        state.version = version
+        state.save(path)
+        return state
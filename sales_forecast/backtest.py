@@ -0,0 +1,106 @@
+import copy
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .columnar import ColumnarHistory
+from .features import FEATURES
+from .models import build_models, mean_absolute_error, r2_score
+
+# Horizontes evaluados desde cada origen, en días con ventas
+DEFAULT_HORIZONS = (7, 14, 30)
+
+RESULT_COLUMNS = ['origen', 'fecha_origen', 'modelo', 'horizonte', 'mae', 'r2']
+
+# Estado de cada proceso del pool: se recibe una sola vez en el inicializador
+_worker_state = {}
+
+
+def rolling_origins(n_rows, min_train, horizon, step=1):
+    """Índices de origen de un backtest con origen móvil (ventana de entrenamiento creciente)."""
+    return list(range(min_train, n_rows - horizon + 1, step))
+
+
+def _init_worker(X, y, models, horizons):
+    _worker_state.update(X=X, y=y, models=models, horizons=horizons)
+
+
+def _init_shared_worker(history_dir, models, horizons):
+    # Cada proceso mapea el mismo archivo en lugar de recibir su propia copia de los datos
+    frame = ColumnarHistory(history_dir).open()
+    _init_worker(frame[FEATURES], frame['ventas_totales_mxn'], models, horizons)
+
+
+def _evaluate_origins(origins):
+    X, y = _worker_state['X'], _worker_state['y']
+    horizons = _worker_state['horizons']
+    max_horizon = max(horizons)
+    rows = []
+    for origin in origins:
+        X_train, y_train = X[:origin], y[:origin]
+        X_test, y_test = X[origin:origin + max_horizon], y[origin:origin + max_horizon]
+        for name, template in _worker_state['models']:
+            # Cada pliegue entrena una copia del estimador sin ajustar (mismo random_state)
+            model = copy.deepcopy(template).fit(X_train, y_train)
+            predicted = model.predict(X_test)
+            for horizon in horizons:
+                if horizon > len(y_test):
+                    continue
+                actual = y_test[:horizon]
+                r2 = r2_score(actual, predicted[:horizon]) if horizon > 1 else np.nan
+                rows.append((origin, name, horizon, mean_absolute_error(actual, predicted[:horizon]), r2))
+    return rows
+
+
+def run_backtest(df_model, models=None, horizons=DEFAULT_HORIZONS, min_train=None, step=1, n_jobs=None):
+    """Evalúa cada modelo candidato sobre muchos orígenes y horizontes (walk-forward).
+
+    Para cada origen se entrena con todas las filas anteriores y se mide MAE/R²
+    en los siguientes `horizonte` días con ventas. Los pliegues se reparten en un
+    pool de procesos (`n_jobs`, por omisión todos los núcleos); el resultado es el
+    mismo sin importar el número de procesos.
+    """
+    models = models if models is not None else build_models()
+    horizons = tuple(sorted(horizons))
+    n_rows = len(df_model)
+    if min_train is None:
+        min_train = max(10, n_rows // 2)
+    origins = rolling_origins(n_rows, min_train, horizons[0], step)
+    if not origins:
+        raise ValueError(f"Historia insuficiente para el backtest: {n_rows} filas, min_train={min_train}")
+
+    X = df_model[FEATURES].reset_index(drop=True)
+    y = df_model['ventas_totales_mxn'].reset_index(drop=True)
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(origins))
+    if n_jobs == 1:
+        _init_worker(X, y, models, horizons)
+        rows = _evaluate_origins(origins)
+    else:
+        # Orígenes intercalados para que cada proceso reciba pliegues de todos los tamaños
+        batches = [origins[i::n_jobs] for i in range(n_jobs)]
+        with tempfile.TemporaryDirectory(prefix='backtest-') as shared_dir:
+            ColumnarHistory(shared_dir).write(X.assign(ventas_totales_mxn=y), 'backtest')
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_shared_worker,
+                                     initargs=(shared_dir, models, horizons)) as pool:
+                rows = [row for batch_rows in pool.map(_evaluate_origins, batches) for row in batch_rows]
+
+    results = pd.DataFrame(rows, columns=['origen', 'modelo', 'horizonte', 'mae', 'r2'])
+    results.insert(1, 'fecha_origen', df_model['fecha'].to_numpy()[results['origen'].to_numpy()])
+    return results.sort_values(['origen', 'modelo', 'horizonte'], ignore_index=True)[RESULT_COLUMNS]
+
+
+def leaderboard(results, by_horizon=False):
+    """Métricas agregadas por modelo (y opcionalmente por horizonte), ordenadas por MAE."""
+    keys = ['modelo', 'horizonte'] if by_horizon else ['modelo']
+    board = results.groupby(keys).agg(
+        mae=('mae', 'mean'),
+        mae_std=('mae', 'std'),
+        r2=('r2', 'mean'),
+        pliegues=('origen', 'nunique'),
+    )
+    return board.sort_values('mae').reset_index()
@@ -0,0 +1,304 @@
+"""Benchmarks del pipeline de ventas sobre historias sintéticas de distintos tamaños.
+
+Cada etapa (ingesta, armado del DataFrame, reportes, características, ajuste,
+predicción y backtest) se mide por separado: tiempo de reloj, tiempo de CPU
+(incluyendo procesos hijos) y memoria pico asignada (tracemalloc). El resultado
+se guarda como JSON y puede compararse contra una línea base para detectar
+regresiones:
+
+    python -m sales_forecast.benchmark --output base.json
+    python -m sales_forecast.benchmark --compare base.json --threshold 0.2
+"""
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import SalesAggregates
+from .backtest import run_backtest
+from .features import add_features
+from .forecast import SalesForecaster
+from .ingestion import DailySalesStore
+from .models import SKLEARN_AVAILABLE, SKLEARN_VERSION
+from .panel import PanelForecaster
+from .synthetic import fit_profile, synthetic_history, synthetic_quotes
+from .telemetry import cpu_seconds
+
+BENCHMARK_FORMAT = 1
+
+# Escalas como "filas" o "filas:series"
+DEFAULT_SCALES = '100,1000,10000,10000:100,100000:1000'
+FULL_SCALES = DEFAULT_SCALES + ',1000000:10000,10000000:10000'
+
+# Máximo de filas con que se corre cada etapa; arriba de eso se omite
+STAGE_MAX_ROWS = {
+    'ingesta': 1_000_000,
+    'dataframe': 1_000_000,
+    'reportes_groupby': 10_000_000,
+    'agregados': 100_000,
+    'caracteristicas': 10_000_000,
+    'ajuste': 100_000,
+    'prediccion': 100_000,
+    'backtest': 10_000,
+    'panel_ajuste': 1_000_000,
+    'panel_prediccion': 1_000_000,
+}
+
+# Orígenes evaluados por el backtest del benchmark (el reporte usa todos)
+BACKTEST_ORIGINS = 20
+FORECAST_DAYS = 365
+PANEL_FORECAST_DAYS = 30
+# Exportación sintética que lee la etapa de ingesta (se escribe antes de medir)
+QUOTES_FILE = 'cotizaciones.csv'
+# Aumentos de tiempo o memoria menores a esto se consideran ruido al comparar,
+# aunque la proporción supere el umbral (5 ms -> 6 ms es +20 %)
+MIN_SECONDS = 0.05
+MIN_MB = 1.0
+
+
+def parse_scales(text):
+    """'100,10000:100' -> [(100, 1), (10000, 100)]"""
+    scales = []
+    for item in text.split(','):
+        rows, _, series = item.strip().partition(':')
+        scales.append((int(float(rows)), int(float(series)) if series else 1))
+    return scales
+
+
+def measure(fn, repeat=1, memory=True):
+    """Corre `fn` `repeat` veces y regresa el mejor tiempo de reloj/CPU y la memoria pico.
+
+    La memoria se mide en una corrida aparte bajo tracemalloc para no inflar los
+    tiempos; sólo cuenta asignaciones trazadas del proceso actual (Python y numpy,
+    no las internas de scikit-learn ni las de procesos hijos).
+    """
+    wall, cpu = [], []
+    for _ in range(repeat):
+        gc.collect()
+        wall_start, cpu_start = time.perf_counter(), cpu_seconds()
+        fn()
+        wall.append(time.perf_counter() - wall_start)
+        cpu.append(cpu_seconds() - cpu_start)
+    result = {'wall_s': min(wall), 'cpu_s': min(cpu), 'peak_mb': None}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_mb'] = peak / 2**20
+    return result
+
+
+def _single_series_stages(history, workdir):
+    """Etapas del reporte de una sola serie, como `(nombre, función)`; la preparación queda fuera."""
+    quotes_path = os.path.join(workdir, QUOTES_FILE)
+    records = history[['fecha', 'cotizaciones_por_dia', 'ventas_totales_mxn']].assign(
+        fecha=history['fecha'].dt.strftime('%Y-%m-%d')).to_dict('records')
+    state = {}
+
+    def ingesta():
+        store = DailySalesStore(tempfile.mkdtemp(dir=workdir))
+        store.update(quotes_path)
+        return store.load()
+
+    def dataframe():
+        df = pd.DataFrame(records)
+        df['fecha'] = pd.to_datetime(df['fecha'])
+        return df
+
+    def reportes_groupby():
+        monthly = history.groupby('mes').agg({'ventas_totales_mxn': ['sum', 'mean', 'count'], 'cotizaciones_por_dia': 'sum'})
+        weekday = history.groupby('dia_semana')['ventas_totales_mxn'].agg(['mean', 'count'])
+        return monthly, weekday, history['ventas_totales_mxn'].describe()
+
+    def agregados():
+        return SalesAggregates.from_history(history)
+
+    def caracteristicas():
+        state['df_model'] = add_features(history)
+        return state['df_model']
+
+    def ajuste():
+        state['forecaster'] = SalesForecaster().fit(state['df_model'])
+        return state['forecaster']
+
+    def prediccion():
+        inicio = history['fecha'].max() + pd.Timedelta(days=1)
+        return state['forecaster'].forecast(inicio, inicio + pd.Timedelta(days=FORECAST_DAYS - 1))
+
+    def backtest():
+        min_train = max(10, len(history) // 2)
+        step = max(1, (len(history) - min_train) // BACKTEST_ORIGINS)
+        return run_backtest(state['df_model'], min_train=min_train, step=step)
+
+    stages = [('ingesta', ingesta), ('dataframe', dataframe), ('reportes_groupby', reportes_groupby),
+              ('agregados', agregados), ('caracteristicas', caracteristicas)]
+    if SKLEARN_AVAILABLE:
+        stages += [('ajuste', ajuste), ('prediccion', prediccion), ('backtest', backtest)]
+    return stages
+
+
+def _panel_stages(history, workdir):
+    """Etapas del pronóstico por serie (producto, cliente, vendedor)."""
+    quotes_path = os.path.join(workdir, QUOTES_FILE)
+    records = history.assign(fecha=history['fecha'].dt.strftime('%Y-%m-%d')).to_dict('records')
+    state = {}
+
+    def ingesta():
+        store = DailySalesStore(tempfile.mkdtemp(dir=workdir), by='serie')
+        store.update(quotes_path)
+        return store.load()
+
+    def dataframe():
+        df = pd.DataFrame(records)
+        df['fecha'] = pd.to_datetime(df['fecha'])
+        return df
+
+    def reportes_groupby():
+        by_serie = history.groupby('serie')['ventas_totales_mxn'].agg(['sum', 'mean', 'count'])
+        monthly = history.groupby(['serie', 'mes'])['ventas_totales_mxn'].sum()
+        return by_serie, monthly
+
+    def caracteristicas():
+        return add_features(history)
+
+    def panel_ajuste():
+        state['forecaster'] = PanelForecaster().fit(history)
+        return state['forecaster']
+
+    def panel_prediccion():
+        inicio = history['fecha'].max() + pd.Timedelta(days=1)
+        return state['forecaster'].forecast(inicio, inicio + pd.Timedelta(days=PANEL_FORECAST_DAYS - 1))
+
+    stages = [('ingesta', ingesta), ('dataframe', dataframe), ('reportes_groupby', reportes_groupby),
+              ('caracteristicas', caracteristicas)]
+    if SKLEARN_AVAILABLE:
+        stages += [('panel_ajuste', panel_ajuste), ('panel_prediccion', panel_prediccion)]
+    return stages
+
+
+def run_scale(n_rows, n_series=1, repeat=1, memory=True, profile=None, log=print):
+    """Mide todas las etapas para una escala; regresa una lista de resultados."""
+    history = synthetic_history(n_rows, n_series, profile=profile)
+    results = []
+    with tempfile.TemporaryDirectory(prefix='sales-bench-') as workdir:
+        if n_rows <= STAGE_MAX_ROWS['ingesta']:
+            # Preparación de la ingesta, fuera de la medición
+            synthetic_quotes(history).to_csv(os.path.join(workdir, QUOTES_FILE), index=False)
+        stages = _single_series_stages(history, workdir) if n_series == 1 else _panel_stages(history, workdir)
+        missing_state = False
+        for stage, fn in stages:
+            entry = {'stage': stage, 'rows': n_rows, 'series': n_series}
+            if n_rows > STAGE_MAX_ROWS[stage] or missing_state:
+                entry['skipped'] = True
+                results.append(entry)
+                log(f"  {stage:18} omitida")
+                # Las etapas siguientes usan el resultado de éstas
+                missing_state = missing_state or stage in ('caracteristicas', 'ajuste', 'panel_ajuste')
+                continue
+            entry.update(measure(fn, repeat=repeat, memory=memory))
+            results.append(entry)
+            peak = f"{entry['peak_mb']:9.1f} MB" if entry['peak_mb'] is not None else '        - MB'
+            log(f"  {stage:18} {entry['wall_s']:9.3f} s  cpu {entry['cpu_s']:9.3f} s  {peak}")
+    return results
+
+
+def run_benchmarks(scales, repeat=1, memory=True, log=print):
+    profile = fit_profile()
+    results = []
+    for n_rows, n_series in scales:
+        log(f"{n_rows:,} filas, {n_series:,} series")
+        results.extend(run_scale(n_rows, n_series, repeat=repeat, memory=memory, profile=profile, log=log))
+    return {
+        'format': BENCHMARK_FORMAT,
+        'meta': {
+            'created': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'sklearn': SKLEARN_VERSION,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """Compara tiempos y memoria pico contra una línea base.
+
+    Regresa un DataFrame con las proporciones actual/base por etapa y escala; una
+    fila es regresión si el tiempo de reloj o la memoria crecen más de `threshold`
+    y además al menos `MIN_SECONDS`/`MIN_MB` en términos absolutos (lo demás es ruido).
+    """
+    keys = ['stage', 'rows', 'series']
+    measured = lambda report: pd.DataFrame([r for r in report['results'] if not r.get('skipped')],
+                                           columns=keys + ['wall_s', 'cpu_s', 'peak_mb'])
+    merged = measured(current).merge(measured(baseline), on=keys, suffixes=('', '_base'))
+    merged['wall_ratio'] = merged['wall_s'] / merged['wall_s_base']
+    # Sin memoria medida (--no-memory) los picos quedan en NaN
+    merged[['peak_mb', 'peak_mb_base']] = merged[['peak_mb', 'peak_mb_base']].astype(float)
+    merged['peak_ratio'] = merged['peak_mb'] / merged['peak_mb_base']
+    slower = (merged['wall_ratio'] > 1 + threshold) & (merged['wall_s'] - merged['wall_s_base'] >= MIN_SECONDS)
+    bigger = (merged['peak_ratio'] > 1 + threshold) & (merged['peak_mb'] - merged['peak_mb_base'] >= MIN_MB)
+    merged['regression'] = slower | bigger
+    return merged[keys + ['wall_s_base', 'wall_s', 'wall_ratio', 'peak_mb_base', 'peak_mb', 'peak_ratio', 'regression']]
+
+
+def _format_number(value, spec):
+    return '-'.rjust(int(spec.split('.')[0])) if pd.isna(value) else format(value, spec)
+
+
+def print_comparison(comparison, threshold):
+    print(f"\n{'Etapa':18} {'Filas':>12} {'Series':>7} | {'Base s':>9} {'Actual s':>9} {'x':>6} | {'Base MB':>9} {'Actual MB':>9} {'x':>6}")
+    for row in comparison.itertuples(index=False):
+        flag = '  <-- regresión' if row.regression else ''
+        print(f"{row.stage:18} {row.rows:12,} {row.series:7,} | {row.wall_s_base:9.3f} {row.wall_s:9.3f} {row.wall_ratio:6.2f} | "
+              f"{_format_number(row.peak_mb_base, '9.1f')} {_format_number(row.peak_mb, '9.1f')} "
+              f"{_format_number(row.peak_ratio, '6.2f')}{flag}")
+    n_regressions = int(comparison['regression'].sum())
+    print(f"\n{n_regressions} regresiones (umbral {threshold:.0%})")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline de ventas con datos sintéticos")
+    parser.add_argument('--scales', default=DEFAULT_SCALES, help="Lista 'filas[:series],...' (p. ej. 1e4:100)")
+    parser.add_argument('--full', action='store_true', help="Incluye escalas de 10^6 y 10^7 filas")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por etapa (se toma el mejor tiempo)")
+    parser.add_argument('--no-memory', action='store_true', help="No medir memoria pico")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON de una corrida anterior")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Crecimiento tolerado antes de marcar regresión")
+    args = parser.parse_args(argv)
+
+    scales = parse_scales(FULL_SCALES if args.full else args.scales)
+    report = run_benchmarks(scales, repeat=args.repeat, memory=not args.no_memory)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados -> {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison = compare(report, baseline, args.threshold)
+        print_comparison(comparison, args.threshold)
+        if comparison['regression'].any():
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
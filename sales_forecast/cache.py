@@ -0,0 +1,101 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def model_params(models):
+    """Descripción serializable (nombre, clase, hiperparámetros) de los modelos candidatos."""
+    params = []
+    for name, model in models:
+        hyperparams = model.get_params() if hasattr(model, 'get_params') else {}
+        params.append([name, f'{type(model).__module__}.{type(model).__name__}', hyperparams])
+    return params
+
+
+def cache_key(df, features, params=None):
+    """Llave de contenido: hash de las filas de entrada, la lista de features y los hiperparámetros."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(json.dumps(list(df.columns)).encode('utf-8'))
+    digest.update(json.dumps(list(features)).encode('utf-8'))
+    digest.update(json.dumps(params, sort_keys=True, default=repr).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """Caché en disco de modelos entrenados y features, direccionada por contenido.
+
+    Cada entrada es un pickle `<llave>.pkl`. Un acceso actualiza su fecha de
+    modificación, y al escribir se desalojan las entradas usadas hace más tiempo
+    hasta quedar por debajo de `max_bytes` (LRU).
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _entries(self):
+        return glob.glob(os.path.join(self.cache_dir, '*.pkl'))
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Entrada corrupta o de una versión incompatible: se trata como fallo
+            os.remove(path)
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        """Regresa `(valor, hit)`; en un fallo calcula el valor con `compute()` y lo guarda."""
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+    def invalidate(self, key=None):
+        """Elimina una entrada, o todas si no se indica `key` (p. ej. al llegar días nuevos)."""
+        paths = [self._path(key)] if key is not None else self._entries()
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,119 @@
+"""Representación compacta de la historia diaria y su archivo columnar en memoria mapeada.
+
+Cada columna se guarda como un `.npy` independiente; al abrirla se mapea con
+`np.load(mmap_mode='r')` y el DataFrame se arma sin copiar, de modo que abrir
+años de historia por SKU es inmediato y varios procesos que abren el mismo
+archivo comparten las páginas del sistema operativo en lugar de duplicarlas.
+"""
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+import numpy as np
+import pandas as pd
+
+HISTORY_FORMAT = 1
+
+# Tipos compactos de las columnas de calendario y conteos
+COMPACT_DTYPES = {
+    'mes': 'int8',
+    'dia_semana': 'int8',
+    'dia_mes': 'int8',
+    'cotizaciones_por_dia': 'int32',
+}
+AMOUNT_COLUMNS = ['ventas_totales_mxn']
+# Error máximo tolerado al guardar montos en float32 (medio centavo)
+AMOUNT_TOLERANCE = 0.005
+
+
+def amount_dtype(values):
+    """float32 si todos los montos se conservan al centavo; si no, float64."""
+    values = np.asarray(values, dtype='float64')
+    if len(values) and np.nanmax(np.abs(values.astype('float32') - values)) < AMOUNT_TOLERANCE:
+        return 'float32'
+    return 'float64'
+
+
+def compact_history(df):
+    """Convierte en su lugar la historia diaria a tipos compactos y la regresa.
+
+    Calendario en int8, cotizaciones en int32, `serie` como categoría y montos en
+    float32 cuando la precisión lo permite (ver `amount_dtype`).
+    """
+    for column, dtype in COMPACT_DTYPES.items():
+        if column in df.columns and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    for column in AMOUNT_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype(amount_dtype(df[column]))
+    if 'serie' in df.columns and not isinstance(df['serie'].dtype, pd.CategoricalDtype):
+        df['serie'] = df['serie'].astype('category')
+    return df
+
+
+def _write_column(directory, name, series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        np.save(os.path.join(directory, f'{name}.npy'), series.cat.codes.to_numpy())
+        return {'name': name, 'kind': 'category', 'categories': series.cat.categories.tolist()}
+    np.save(os.path.join(directory, f'{name}.npy'), series.to_numpy())
+    return {'name': name, 'kind': 'array'}
+
+
+class ColumnarHistory:
+    """Historia diaria en un directorio de columnas `.npy` abiertas con memoria mapeada.
+
+    Cada escritura crea una generación nueva y cambia el apuntador `current.json`
+    de forma atómica; los lectores que ya la tienen abierta no se ven afectados.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.pointer_path = os.path.join(directory, 'current.json')
+
+    def _current(self):
+        if not os.path.exists(self.pointer_path):
+            return None
+        with open(self.pointer_path) as f:
+            current = json.load(f)
+        return current if current.get('format') == HISTORY_FORMAT else None
+
+    def version(self):
+        current = self._current()
+        return None if current is None else current['version']
+
+    def write(self, df, version):
+        os.makedirs(self.directory, exist_ok=True)
+        generation = uuid.uuid4().hex[:12]
+        generation_dir = os.path.join(self.directory, generation)
+        os.makedirs(generation_dir)
+        columns = [_write_column(generation_dir, name, df[name]) for name in df.columns]
+        current = {'format': HISTORY_FORMAT, 'version': version, 'generation': generation,
+                   'rows': len(df), 'columns': columns}
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(current, f)
+        os.replace(tmp_path, self.pointer_path)
+        # Generaciones anteriores: en POSIX los lectores con el archivo abierto lo conservan
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name != generation and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def open(self):
+        """DataFrame de sólo lectura respaldado por los archivos (None si no hay historia)."""
+        current = self._current()
+        if current is None:
+            return None
+        generation_dir = os.path.join(self.directory, current['generation'])
+        data = {}
+        for column in current['columns']:
+            values = np.load(os.path.join(generation_dir, f"{column['name']}.npy"), mmap_mode='r')
+            if column['kind'] == 'category':
+                values = pd.Categorical.from_codes(values, dtype=pd.CategoricalDtype(column['categories']), validate=False)
+            data[column['name']] = values
+        # copy=False evita copiar y consolidar las columnas en bloques
+        return pd.DataFrame(data, copy=False)
+
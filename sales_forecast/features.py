@@ -0,0 +1,56 @@
+import pandas as pd
+
+
+def dia_semana(fechas):
+    """Día de la semana con la convención de Postgres (0 = Domingo, 6 = Sábado)."""
+    return (fechas.dt.dayofweek + 1) % 7
+
+
+def add_calendar_columns(df):
+    """Agrega `mes`, `dia_semana` y `dia_mes` (int8) a partir de la columna `fecha`."""
+    fechas = pd.to_datetime(df['fecha'])
+    df['fecha'] = fechas
+    df['mes'] = fechas.dt.month.astype('int8')
+    df['dia_semana'] = dia_semana(fechas).astype('int8')
+    df['dia_mes'] = fechas.dt.day.astype('int8')
+    return df
+
+
+# Features para el modelo
+FEATURES = ['mes', 'dia_semana', 'dia_mes', 'day_of_year', 'week_of_year', 'is_weekend', 'days_since_start', 'cotizaciones_por_dia']
+
+
+def calendar_features(fechas, origen, cotizaciones):
+    """Matriz de características para un rango de fechas en una sola pasada vectorizada.
+
+    `origen` es la primera fecha de la historia de entrenamiento (base de
+    `days_since_start`) y `cotizaciones` el número de cotizaciones esperado por día
+    (escalar o un valor por fecha).
+    """
+    fechas = pd.DatetimeIndex(fechas)
+    dow = ((fechas.dayofweek + 1) % 7).astype('int8')
+    return pd.DataFrame({
+        'mes': fechas.month.astype('int8'),
+        'dia_semana': dow,
+        'dia_mes': fechas.day.astype('int8'),
+        'day_of_year': fechas.dayofyear.astype('int16'),
+        'week_of_year': fechas.isocalendar().week.to_numpy(dtype='int8'),
+        'is_weekend': ((dow == 0) | (dow == 6)).astype('int8'),
+        'days_since_start': (fechas - pd.Timestamp(origen)).days.astype('int32'),
+        'cotizaciones_por_dia': cotizaciones,
+    }, columns=FEATURES)
+
+
+def add_features(df):
+    """Historia diaria con las características del modelo, sin copiar `df`.
+
+    Parte de una copia superficial: las columnas existentes se comparten con `df`
+    (aunque estén en memoria mapeada) y sólo se asignan las nuevas, en tipos compactos.
+    """
+    df_model = df.copy(deep=False)
+    fechas = df_model['fecha']
+    df_model['day_of_year'] = fechas.dt.dayofyear.astype('int16')
+    df_model['week_of_year'] = fechas.dt.isocalendar().week.astype('int8')
+    df_model['is_weekend'] = df_model['dia_semana'].isin([0, 6]).astype('int8')
+    df_model['days_since_start'] = (fechas - fechas.min()).dt.days.astype('int32')
+    return df_model
@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from .features import FEATURES, calendar_features, dia_semana
+from .models import (ResidualQuantiles, WeekdayAverage, build_models, describe_model, has_tree_spread, predict,
+                     predict_interval)
+
+
+def interval_columns(name):
+    """Nombres de las columnas del intervalo de un modelo."""
+    return f'{name} inferior', f'{name} superior'
+
+
+class SalesForecaster:
+    """Modelos entrenados sobre la historia diaria y pronóstico por rango de fechas.
+
+    Con `level` el pronóstico incluye un intervalo de predicción por modelo
+    (columnas `<modelo> inferior` y `<modelo> superior`): del random forest, por
+    cuantiles entre árboles; de los demás, por cuantiles de sus residuales de
+    entrenamiento (por día de la semana en el promedio semanal). Para totales por
+    periodo se usa `expected_forecast`, que pondera cada día por la probabilidad
+    de que haya ventas.
+    """
+
+    def __init__(self, models=None):
+        self.models = models if models is not None else build_models()
+
+    def fit(self, df_model):
+        self.origen_ = df_model['fecha'].min()
+        # Estimación basada en promedio histórico
+        self.cotizaciones_ = max(1, int(round(df_model['cotizaciones_por_dia'].mean())))
+        # P(venta | día de la semana): la historia sólo trae días con ventas
+        calendario = pd.date_range(self.origen_, df_model['fecha'].max(), freq='D')
+        dias = np.bincount((calendario.dayofweek + 1) % 7, minlength=7)
+        dias_con_venta = np.bincount(dia_semana(df_model['fecha'].drop_duplicates()).to_numpy(dtype=int), minlength=7)
+        self.sale_probability_ = np.divide(dias_con_venta, dias, out=np.zeros(7), where=dias > 0)
+        X, y = df_model[FEATURES], df_model['ventas_totales_mxn']
+        # Estadísticas de ajuste por modelo para la telemetría de la corrida
+        self.fit_stats_ = {}
+        self.residuals_ = {}
+        for name, model in self.models:
+            started = time.perf_counter()
+            model.fit(X, y)
+            self.fit_stats_[name] = dict(fit_seconds=time.perf_counter() - started, train_rows=len(X),
+                                         features=X.shape[1], **describe_model(model))
+            if not has_tree_spread(model):
+                self.residuals_[name] = ResidualQuantiles(y.to_numpy() - predict(model, X), self._interval_groups(model, X))
+        return self
+
+    def _interval_groups(self, model, X):
+        return X['dia_semana'].to_numpy() if isinstance(model, WeekdayAverage) else None
+
+    def predict(self, X, models=None, level=None):
+        """Predicciones de los modelos indicados (todos por omisión) sobre una matriz ya armada."""
+        columns = {}
+        for name, model in self.models:
+            if models is not None and name not in models:
+                continue
+            if level is None:
+                columns[name] = predict(model, X)
+                continue
+            lower_name, upper_name = interval_columns(name)
+            columns[name], columns[lower_name], columns[upper_name] = predict_interval(
+                model, X, level, self.residuals_.get(name), self._interval_groups(model, X))
+        return pd.DataFrame(columns, index=X.index)
+
+    def forecast_dates(self, fechas, cotizaciones=None, models=None, level=None):
+        """Predicciones para fechas arbitrarias (una llamada a `predict` por modelo)."""
+        fechas = pd.DatetimeIndex(fechas)
+        X = calendar_features(fechas, self.origen_, self.cotizaciones_ if cotizaciones is None else cotizaciones)
+        predictions = self.predict(X, models, level)
+        predictions.insert(0, 'fecha', fechas)
+        return predictions
+
+    def forecast(self, start, end, cotizaciones=None, models=None, level=None):
+        """Pronóstico diario de cada modelo para todas las fechas en [start, end].
+
+        La matriz de características se arma en una sola pasada y cada modelo se
+        evalúa con una sola llamada a `predict` sobre todo el horizonte; el
+        intervalo (si se pide `level`) sale de esa misma pasada.
+        """
+        return self.forecast_dates(pd.date_range(start, end, freq='D'), cotizaciones, models, level)
+
+    def expected_forecast(self, start, end, models=None):
+        """Ventas esperadas por día calendario en [start, end], para sumar totales.
+
+        Los modelos predicen la venta de un día *con* ventas; aquí cada día se
+        multiplica por la probabilidad empírica de que su día de la semana tenga
+        ventas (`sale_probability_`), así que los domingos sin historia suman 0.
+        """
+        forecast = self.forecast(start, end, models=models)
+        probability = self.sale_probability_[dia_semana(forecast['fecha']).to_numpy(dtype=int)]
+        names = [name for name in forecast.columns if name != 'fecha']
+        forecast[names] = forecast[names].mul(probability, axis=0)
+        return forecast
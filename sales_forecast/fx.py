@@ -0,0 +1,264 @@
+"""Tipos de cambio de Banxico con caché local y unión as-of vectorizada.
+
+La tabla local (`tipos_cambio.csv` en la caché) guarda el FIX diario de cada
+moneda (pesos por unidad) y se completa de forma incremental: sólo se consultan
+a Banxico las fechas que aún no se han consultado. Sin red o sin token se usa lo
+que haya en caché más un archivo sustituto (`BANXICO_RATES_FILE`, CSV con
+`fecha,moneda,tipo_cambio` o una respuesta JSON guardada de la API).
+
+Cada fecha toma el FIX del día hábil anterior más cercano (el que publica el DOF
+para pagos de ese día), con un `searchsorted` sobre la serie ordenada en lugar de
+buscar fila por fila.
+"""
+import json
+import os
+import tempfile
+import urllib.request
+import warnings
+
+import numpy as np
+import pandas as pd
+
+BASE_CURRENCY = 'MXN'
+# Series SIE de Banxico (las mismas que usan src/app/api/banxico y api/exchange-rate)
+BANXICO_SERIES = {'USD': 'SF43718', 'EUR': 'SF46410'}
+BANXICO_URL = 'https://www.banxico.org.mx/SieAPIRest/service/v1/series/{serie}/datos/{inicio}/{fin}'
+BANXICO_TIMEOUT_SECONDS = 10
+# Tras un intento fallido, o si sólo falta el FIX de hoy, no se vuelve a consultar antes de esto
+BANXICO_RETRY_SECONDS = 3600
+RATE_COLUMNS = ['fecha', 'moneda', 'tipo_cambio']
+
+
+class MissingRateError(ValueError):
+    """No hay tipo de cambio para alguna fecha (sin token, sin red y sin archivo sustituto)."""
+
+
+def parse_banxico(payload):
+    """Filas `fecha, moneda, tipo_cambio` de una respuesta JSON de la API SIE."""
+    by_serie = {serie: moneda for moneda, serie in BANXICO_SERIES.items()}
+    frames = []
+    for serie in payload.get('bmx', {}).get('series', []):
+        datos = pd.DataFrame(serie.get('datos') or [], columns=['fecha', 'dato'])
+        frames.append(pd.DataFrame({
+            'fecha': pd.to_datetime(datos['fecha'], format='%d/%m/%Y'),
+            'moneda': by_serie.get(serie.get('idSerie'), serie.get('idSerie')),
+            # Días sin dato llegan como 'N/E'
+            'tipo_cambio': pd.to_numeric(datos['dato'].str.replace(',', ''), errors='coerce'),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=RATE_COLUMNS)
+    return pd.concat(frames, ignore_index=True).dropna()
+
+
+def read_rates_file(path):
+    """Tabla sustituta para correr sin red: CSV `fecha,moneda,tipo_cambio` o JSON de Banxico."""
+    if path.endswith('.json'):
+        with open(path) as f:
+            return parse_banxico(json.load(f))
+    rates = pd.read_csv(path)
+    rates['fecha'] = pd.to_datetime(rates['fecha'])
+    rates['moneda'] = rates['moneda'].str.upper()
+    return rates[RATE_COLUMNS]
+
+
+class RateTable:
+    """Tipos de cambio diarios (pesos por unidad de moneda) indexados por fecha.
+
+    `asof(fechas, moneda)` asegura que el rango esté en la tabla local
+    (consultando a Banxico sólo lo que falta) y regresa un arreglo alineado con
+    `fechas`. Las series ya cargadas se quedan en memoria, así que volver a
+    convertir años de historia no repite consultas.
+    """
+
+    def __init__(self, cache_dir, token=None, rates_file=None, fetch=True):
+        self.path = os.path.join(cache_dir, 'tipos_cambio.csv')
+        self.meta_path = os.path.join(cache_dir, 'tipos_cambio.json')
+        self.token = token if token is not None else os.environ.get('BANXICO_TOKEN')
+        self.rates_file = rates_file if rates_file is not None else os.environ.get('BANXICO_RATES_FILE')
+        self.fetch = fetch
+        self._table = None
+        self._series = {}
+        self._warned = set()
+
+    def _load(self):
+        if self._table is not None:
+            return
+        frames = []
+        if os.path.exists(self.path):
+            cached = pd.read_csv(self.path, parse_dates=['fecha'])
+            frames.append(cached[RATE_COLUMNS])
+        if self.rates_file:
+            frames.append(read_rates_file(self.rates_file))
+        self._table = self._combine(frames)
+        self._meta = {}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self._meta = json.load(f)
+
+    def _combine(self, frames):
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return pd.DataFrame({'fecha': pd.Series(dtype='datetime64[ns]'), 'moneda': pd.Series(dtype=object),
+                                 'tipo_cambio': pd.Series(dtype='float64')})
+        table = pd.concat(frames, ignore_index=True)
+        # Para una misma fecha gana la fuente más reciente (la última en `frames`)
+        table = table.drop_duplicates(['moneda', 'fecha'], keep='last')
+        return table.sort_values(['moneda', 'fecha'], ignore_index=True)
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        for path, write in ((self.path, lambda f: self._table.to_csv(f, index=False, date_format='%Y-%m-%d')),
+                            (self.meta_path, lambda f: json.dump(self._meta, f))):
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                write(f)
+            os.replace(tmp_path, path)
+
+    def _warn(self, moneda, message):
+        if moneda not in self._warned:
+            self._warned.add(moneda)
+            warnings.warn(message, RuntimeWarning, stacklevel=3)
+
+    def _download(self, moneda, inicio, fin):
+        url = BANXICO_URL.format(serie=BANXICO_SERIES[moneda], inicio=f'{inicio:%Y-%m-%d}', fin=f'{fin:%Y-%m-%d}')
+        request = urllib.request.Request(url, headers={'Bmx-Token': self.token, 'Accept': 'application/json'})
+        with urllib.request.urlopen(request, timeout=BANXICO_TIMEOUT_SECONDS) as response:
+            return parse_banxico(json.load(response))
+
+    def _recently_tried(self, moneda, gaps, today):
+        """True si no toca consultar otra vez: el último intento fue hace menos de
+        `BANXICO_RETRY_SECONDS` y falló, o sólo falta hoy (su FIX puede no estar publicado aún)."""
+        attempt = self._meta.get(moneda, {}).get('intento')
+        if attempt is None:
+            return False
+        if (pd.Timestamp.now() - pd.Timestamp(attempt['fecha'])).total_seconds() >= BANXICO_RETRY_SECONDS:
+            return False
+        return not attempt['ok'] or all(inicio >= today for inicio, _ in gaps)
+
+    def refresh(self, moneda, start, end=None):
+        """Consulta a Banxico sólo los tramos de [start, end] que nunca se han consultado.
+
+        El día de hoy (y cualquier tramo tras un intento fallido) se reintenta a lo
+        más una vez cada `BANXICO_RETRY_SECONDS`, así que convertir muchas veces en
+        la misma corrida o en el servicio no repite consultas.
+        """
+        self._load()
+        today = pd.Timestamp.today().normalize()
+        start = pd.Timestamp(start).normalize()
+        end = min(pd.Timestamp(end).normalize() if end is not None else today, today)
+        consulted = self._meta.get(moneda, {})
+        if 'desde' not in consulted:
+            gaps = [(start, end)]
+        else:
+            desde, hasta = pd.Timestamp(consulted['desde']), pd.Timestamp(consulted['hasta'])
+            gaps = [(start, min(end, desde - pd.Timedelta(days=1))), (max(start, hasta + pd.Timedelta(days=1)), end)]
+        gaps = [(inicio, fin) for inicio, fin in gaps if inicio <= fin]
+        if not gaps or not self.fetch:
+            return False
+        if moneda not in BANXICO_SERIES or not self.token:
+            # Con archivo sustituto no consultar es lo esperado
+            if not self.rates_file:
+                self._warn(moneda, f"Sin token de Banxico (BANXICO_TOKEN) para {moneda}; se usan los tipos de cambio en caché")
+            return False
+        if self._recently_tried(moneda, gaps, today):
+            return False
+
+        meta = self._meta.setdefault(moneda, {})
+        try:
+            downloaded = [self._download(moneda, inicio, fin) for inicio, fin in gaps]
+        except (OSError, ValueError) as exc:
+            self._warn(moneda, f"No se pudo consultar Banxico para {moneda} ({exc}); se usan los tipos de cambio en caché")
+            meta['intento'] = {'fecha': pd.Timestamp.now().isoformat(timespec='seconds'), 'ok': False}
+            self._save()
+            return False
+        meta['intento'] = {'fecha': pd.Timestamp.now().isoformat(timespec='seconds'), 'ok': True}
+        self._table = self._combine([self._table] + downloaded)
+        # Banxico publica el FIX del día hacia mediodía: hoy nunca queda como consultado,
+        # para pedirlo otra vez (pasado `BANXICO_RETRY_SECONDS`)
+        consulted_end = min(end, today - pd.Timedelta(days=1))
+        if consulted_end >= start:
+            bounds = [start, consulted_end] + ([pd.Timestamp(consulted['desde']), pd.Timestamp(consulted['hasta'])]
+                                               if 'desde' in consulted else [])
+            meta.update(desde=f'{min(bounds):%Y-%m-%d}', hasta=f'{max(bounds):%Y-%m-%d}')
+        self._series.pop(moneda, None)
+        self._save()
+        return True
+
+    def series(self, moneda):
+        """Fechas y tipos de cambio de una moneda, ordenados (arreglos en memoria)."""
+        self._load()
+        if moneda not in self._series:
+            rows = self._table[self._table['moneda'] == moneda]
+            self._series[moneda] = (rows['fecha'].to_numpy(dtype='datetime64[ns]'), rows['tipo_cambio'].to_numpy(dtype='float64'))
+        return self._series[moneda]
+
+    def asof(self, fechas, moneda, allow_same_day=False):
+        """Pesos por unidad de `moneda` para cada fecha (as-of: FIX del día hábil anterior).
+
+        Las fechas posteriores al último FIX disponible (p. ej. un pronóstico)
+        usan el último; las anteriores al primero son un error.
+        """
+        moneda = moneda.upper()
+        fechas = pd.DatetimeIndex(fechas)
+        if moneda == BASE_CURRENCY:
+            return np.ones(len(fechas))
+        if len(fechas) == 0:
+            return np.empty(0)
+        # Desde una semana antes para cubrir el día hábil anterior a la primera fecha
+        self.refresh(moneda, fechas.min() - pd.Timedelta(days=7), fechas.max())
+        dates, values = self.series(moneda)
+        positions = np.searchsorted(dates, fechas.to_numpy(dtype='datetime64[ns]'),
+                                    side='right' if allow_same_day else 'left') - 1
+        if len(dates) == 0 or (positions < 0).any():
+            missing = fechas[positions < 0] if len(dates) else fechas
+            raise MissingRateError(f"Sin tipo de cambio {moneda} para {missing.min():%Y-%m-%d}"
+                             f"{'' if len(missing) == 1 else f' a {missing.max():%Y-%m-%d}'}")
+        return values[positions]
+
+
+def amounts_in_mxn(amounts, monedas, fechas, rates, tipo_cambio=None):
+    """Convierte montos de varias monedas a pesos, una unión as-of por moneda.
+
+    `tipo_cambio` (el guardado en cada cotización) tiene prioridad cuando es positivo.
+    """
+    amounts = np.asarray(amounts, dtype='float64')
+    monedas = pd.Series(monedas).fillna(BASE_CURRENCY).astype(str).str.upper().to_numpy()
+    fechas = pd.DatetimeIndex(fechas)
+    factor = np.ones(len(amounts))
+    for moneda in np.unique(monedas):
+        if moneda == BASE_CURRENCY:
+            continue
+        rows = monedas == moneda
+        if rates is None:
+            raise MissingRateError(f"Hay montos en {moneda} y no se indicó tabla de tipos de cambio")
+        factor[rows] = rates.asof(fechas[rows], moneda)
+    if tipo_cambio is not None:
+        stored = pd.to_numeric(pd.Series(tipo_cambio), errors='coerce').to_numpy(dtype='float64')
+        use_stored = (monedas != BASE_CURRENCY) & (stored > 0)
+        factor[use_stored] = stored[use_stored]
+    return amounts * factor
+
+
+def convert_history(daily, moneda, rates, amount_col='ventas_totales_mxn'):
+    """Historia diaria con los montos expresados en `moneda` (columna con el mismo nombre).
+
+    Cada día se divide entre el FIX del día hábil anterior; el resto de las
+    columnas se comparte con `daily` (copia superficial).
+    """
+    if moneda.upper() == BASE_CURRENCY:
+        return daily
+    converted = daily.copy(deep=False)
+    converted[amount_col] = daily[amount_col].to_numpy(dtype='float64') / rates.asof(daily['fecha'], moneda)
+    return converted
+
+
+def convert_forecast(forecast, moneda, rates):
+    """Pronóstico (columnas numéricas por modelo) expresado en `moneda` con el FIX as-of de cada fecha."""
+    if moneda.upper() == BASE_CURRENCY:
+        return forecast
+    factor = 1 / rates.asof(forecast['fecha'], moneda)
+    converted = forecast.copy(deep=False)
+    for column in converted.columns:
+        if column not in ('fecha', 'serie', 'probabilidad_venta') and pd.api.types.is_numeric_dtype(converted[column]):
+            converted[column] = converted[column].to_numpy(dtype='float64') * factor
+    return converted
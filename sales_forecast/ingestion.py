@@ -0,0 +1,404 @@
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+from .columnar import ColumnarHistory, compact_history
+from .features import add_calendar_columns
+from .fx import amounts_in_mxn
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Forma diaria que consume el análisis (la misma de `sales_data`)
+DAILY_COLUMNS = ['fecha', 'cotizaciones_por_dia', 'ventas_totales_mxn', 'mes', 'dia_semana', 'dia_mes']
+
+LOCAL_TZ = 'America/Mexico_City'
+DEFAULT_CHUNKSIZE = 100_000
+MAX_PARTS = 32
+FINGERPRINT_BYTES = 4096
+
+# Encabezados de `api/cotizaciones/export-csv` (una fila por producto cotizado)
+EXPORT_COLUMNS = {
+    'Cotización ID': 'cotizacion_id',
+    'Folio': 'folio',
+    'Cliente': 'cliente',
+    'Producto': 'producto',
+    'SKU': 'sku',
+    'Precio': 'precio',
+    'Cantidad': 'cantidad',
+    'Fecha Creación': 'fecha_creacion',
+    'Estado': 'estado',
+    'Fecha Anticipo': 'fecha_anticipo',
+}
+# Estados de una cotización que ya es venta (formulario de cambio de estado de la app)
+SALE_STATES = ('producción', 'enviar_inventario')
+# Fechas de `toLocaleDateString('es-MX')`: día/mes/año, ya en hora local
+_DAY_FIRST = re.compile(r'^\d{1,2}/\d{1,2}/\d{4}$')
+
+
+class _BoundedReader(io.RawIOBase):
+    """Lector binario que expone sólo el rango [start, end) de un archivo."""
+
+    def __init__(self, f, start, end):
+        self._f = f
+        self._f.seek(start)
+        self._remaining = end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:self._remaining]
+        n = self._f.readinto(view)
+        self._remaining -= n
+        return n
+
+
+def _source_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if ext in ('.db', '.sqlite', '.sqlite3'):
+        return 'sqlite'
+    raise ValueError(f"Formato de exportación no soportado: {path}")
+
+
+def _complete_lines_end(f, size):
+    """Posición justo después del último salto de línea (ignora una línea a medio escribir)."""
+    pos = size
+    while pos > 0:
+        block = min(FINGERPRINT_BYTES, pos)
+        f.seek(pos - block)
+        idx = f.read(block).rfind(b'\n')
+        if idx != -1:
+            return pos - block + idx + 1
+        pos -= block
+    return 0
+
+
+def _is_complete_row(tail, fmt, n_fields):
+    """True si la última línea sin salto de línea ya es una fila completa.
+
+    El exportador de la app (`api/cotizaciones/export-csv`) no termina el archivo
+    con salto de línea; una línea que se está escribiendo casi nunca cumple esto.
+    """
+    try:
+        text = tail.decode('utf-8')
+        if fmt == 'csv':
+            rows = list(csv.reader([text], strict=True))
+            return len(rows) == 1 and len(rows[0]) == n_fields
+        return isinstance(json.loads(text), dict)
+    except (UnicodeDecodeError, csv.Error, ValueError):
+        return False
+
+
+def _fingerprint(f, offset):
+    """Hash de los bytes previos al watermark; si cambian, el archivo fue reescrito."""
+    start = max(0, offset - FINGERPRINT_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def _text_chunks(path, fmt, start, end, chunksize, names=None):
+    f = open(path, 'rb')
+    stream = io.TextIOWrapper(io.BufferedReader(_BoundedReader(f, start, end)), encoding='utf-8')
+    try:
+        if fmt == 'csv':
+            reader = pd.read_csv(stream, names=names, header=None, chunksize=chunksize)
+        else:
+            reader = pd.read_json(stream, lines=True, chunksize=chunksize)
+        for chunk in reader:
+            yield chunk
+    finally:
+        stream.close()
+        f.close()
+
+
+def read_export_chunks(path, watermark=None, chunksize=DEFAULT_CHUNKSIZE, table='cotizaciones'):
+    """Lee una exportación de cotizaciones por bloques a partir de `watermark`.
+
+    Regresa `(chunks, nuevo_watermark)`. `chunks` es un generador de DataFrames
+    con las filas agregadas desde la última lectura; si el archivo fue truncado o
+    reescrito se vuelve a leer desde el principio. Una última línea sin salto de
+    línea se lee si ya es una fila completa; si después se alarga en lugar de
+    seguir con una línea nueva, el archivo se vuelve a leer completo.
+    """
+    fmt = _source_format(path)
+    source = os.path.abspath(path)
+    previous = watermark if watermark and watermark.get('source') == source else None
+
+    if fmt == 'sqlite':
+        last_rowid = previous['offset'] if previous else 0
+        conn = sqlite3.connect(source)
+        new_rowid = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+        full = previous is None or new_rowid < last_rowid
+        if full:
+            last_rowid = 0
+
+        def chunks():
+            try:
+                query = f"SELECT * FROM {table} WHERE rowid > ? AND rowid <= ? ORDER BY rowid"
+                for chunk in pd.read_sql_query(query, conn, params=(last_rowid, new_rowid), chunksize=chunksize):
+                    yield chunk
+            finally:
+                conn.close()
+
+        return chunks(), {'source': source, 'format': fmt, 'offset': new_rowid, 'full': full}
+
+    with open(source, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        header = f.readline() if fmt == 'csv' else b''
+        names = next(csv.reader([header.decode('utf-8-sig')])) if fmt == 'csv' else None
+        end = _complete_lines_end(f, size)
+        terminated = True
+        if len(header) <= end < size:
+            f.seek(end)
+            if _is_complete_row(f.read(size - end), fmt, len(names or ())):
+                end, terminated = size, False
+
+        start = len(header)
+        if previous and previous.get('header') == header.decode('utf-8') and start <= previous['offset'] <= end:
+            if _fingerprint(f, previous['offset']) == previous['fingerprint']:
+                start = previous['offset']
+            if not previous.get('terminated', True) and start < end:
+                # La última fila leída no tenía salto de línea: sólo sigue siendo
+                # válida si lo nuevo empieza con uno
+                f.seek(start)
+                if f.read(1) != b'\n':
+                    start = len(header)
+        full = start == len(header)
+        fingerprint = _fingerprint(f, end)
+
+    new_watermark = {
+        'source': source,
+        'format': fmt,
+        'offset': end,
+        'header': header.decode('utf-8'),
+        'fingerprint': fingerprint,
+        'terminated': terminated,
+        'full': full,
+    }
+    return _text_chunks(source, fmt, start, end, chunksize, names), new_watermark
+
+
+def parse_estados(text):
+    """Estados separados por coma para `--estados`; `todos` quita el filtro."""
+    if text.strip().lower() == 'todos':
+        return None
+    return tuple(estado.strip() for estado in text.split(',') if estado.strip())
+
+
+def _to_local_dates(values):
+    first = values.dropna()
+    if len(first) and _DAY_FIRST.match(str(first.iloc[0])):
+        return pd.to_datetime(values, format='%d/%m/%Y')
+    fechas = pd.to_datetime(values, format='ISO8601')
+    if fechas.dt.tz is not None:
+        fechas = fechas.dt.tz_convert(LOCAL_TZ).dt.tz_localize(None)
+    return fechas.dt.normalize()
+
+
+def aggregate_daily(chunk, date_col='fecha_creacion', amount_col='total_mxn', estados=SALE_STATES, by=None, rates=None):
+    """Reduce un bloque de cotizaciones a totales por día.
+
+    Sólo cuentan las cotizaciones en `estados` (por omisión las que ya son venta;
+    `None` cuenta todas), si la exportación trae la columna `estado`.
+
+    Acepta tanto cotizaciones individuales (una fila por cotización) como una
+    exportación ya diaria con `fecha`/`cotizaciones_por_dia`/`ventas_totales_mxn`.
+    Si la exportación es por producto (`precio`/`cantidad`, como la de
+    `api/cotizaciones/export-csv`, cuyos encabezados y fechas `d/m/aaaa` se
+    reconocen) el monto es `precio * cantidad` y cada cotización cuenta una vez
+    por día y serie. Si no trae
+    montos en pesos pero sí `total`/`moneda`, se convierten con el `tipo_cambio`
+    de la cotización o, si falta, con la tabla `rates` (`fx.RateTable`). Con `by`
+    (p. ej. `sku`, `cliente` o `vendedor_id`) los totales son por serie y día.
+    """
+    if 'ventas_totales_mxn' in chunk.columns:
+        date_col, amount_col = 'fecha', 'ventas_totales_mxn'
+    if EXPORT_COLUMNS.keys() & set(chunk.columns):
+        chunk = chunk.rename(columns=EXPORT_COLUMNS)
+    if estados is not None and 'estado' in chunk.columns:
+        chunk = chunk[chunk['estado'].isin(estados)]
+
+    if 'cotizaciones_por_dia' in chunk.columns:
+        counts = chunk['cotizaciones_por_dia'].fillna(0).astype('int64')
+    elif 'cotizacion_id' in chunk.columns:
+        # Varias filas (productos) de una misma cotización cuentan como una
+        counts = (~chunk.duplicated(['cotizacion_id'] + ([by] if by else []))).astype('int64')
+    else:
+        counts = pd.Series(1, index=chunk.index, dtype='int64')
+
+    fechas = _to_local_dates(chunk[date_col])
+    if amount_col not in chunk.columns and {'total', 'moneda'} <= set(chunk.columns):
+        amounts = pd.Series(amounts_in_mxn(pd.to_numeric(chunk['total'], errors='coerce'), chunk['moneda'], fechas, rates,
+                                           chunk['tipo_cambio'] if 'tipo_cambio' in chunk.columns else None),
+                            index=chunk.index)
+    elif amount_col not in chunk.columns and {'precio', 'cantidad'} <= set(chunk.columns):
+        amounts = pd.to_numeric(chunk['precio'], errors='coerce') * pd.to_numeric(chunk['cantidad'], errors='coerce')
+    else:
+        amounts = pd.to_numeric(chunk[amount_col], errors='coerce')
+
+    daily = pd.DataFrame({
+        'fecha': fechas,
+        'cotizaciones_por_dia': counts,
+        'ventas_totales_mxn': amounts.fillna(0.0),
+    })
+    if by is None:
+        return daily.groupby('fecha').sum()
+    daily.insert(0, 'serie', chunk[by].astype(str).to_numpy())
+    return daily.groupby(['serie', 'fecha']).sum()
+
+
+class DailySalesStore:
+    """Caché columnar (Parquet) de la historia diaria de ventas con watermark incremental.
+
+    Cada `update` lee sólo las filas agregadas a la exportación desde la última
+    corrida, por bloques, y escribe una partición nueva con sus totales diarios.
+    La memoria usada depende del número de días, no del tamaño del archivo.
+    """
+
+    def __init__(self, cache_dir, chunksize=DEFAULT_CHUNKSIZE, by=None):
+        self.cache_dir = cache_dir
+        self.chunksize = chunksize
+        # Columna que separa series (producto, cliente, vendedor); None = una sola serie
+        self.by = by
+        self.keys = ['fecha'] if by is None else ['serie', 'fecha']
+        self.parts_dir = os.path.join(cache_dir, 'daily')
+        self.watermark_path = os.path.join(cache_dir, 'watermark.json')
+        # Historia completa en tipos compactos, abierta con memoria mapeada
+        self.history = ColumnarHistory(os.path.join(cache_dir, 'history'))
+        self.extension = '.parquet' if PARQUET_AVAILABLE else '.pkl'
+        self.rebuilt = False
+
+    def watermark(self):
+        if not os.path.exists(self.watermark_path):
+            return None
+        with open(self.watermark_path) as f:
+            return json.load(f)
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.parts_dir, f'part-*{self.extension}')))
+
+    def _write_part(self, daily, path):
+        if PARQUET_AVAILABLE:
+            daily.to_parquet(path, index=False)
+        else:
+            daily.to_pickle(path)
+
+    def _read_part(self, path):
+        if PARQUET_AVAILABLE:
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _clear(self):
+        for path in self._parts():
+            os.remove(path)
+
+    def update(self, source, date_col='fecha_creacion', amount_col='total_mxn', estados=SALE_STATES, table='cotizaciones', rates=None):
+        """Ingiere las filas nuevas de `source`.
+
+        Regresa los totales diarios aportados por esas filas (`fecha`,
+        `cotizaciones_por_dia`, `ventas_totales_mxn`); un día ya existente aparece
+        sólo con su incremento. `self.rebuilt` indica si se tuvo que releer todo,
+        p. ej. porque cambiaron `by` o `estados`.
+        """
+        os.makedirs(self.parts_dir, exist_ok=True)
+        estados = sorted(estados) if estados is not None else None
+        previous = self.watermark()
+        if previous is not None and (previous.get('by') != self.by or previous.get('estados') != estados):
+            previous = None
+        chunks, watermark = read_export_chunks(source, previous, self.chunksize, table)
+        watermark.update(by=self.by, estados=estados)
+
+        totals = None
+        for chunk in chunks:
+            daily = aggregate_daily(chunk, date_col, amount_col, estados, self.by, rates)
+            totals = daily if totals is None else totals.add(daily, fill_value=0)
+
+        self.rebuilt = watermark.pop('full')
+        if self.rebuilt:
+            self._clear()
+
+        if totals is None:
+            deltas = self._empty()
+        else:
+            deltas = totals.reset_index()
+            deltas['cotizaciones_por_dia'] = deltas['cotizaciones_por_dia'].astype('int64')
+        if len(deltas):
+            parts = self._parts()
+            next_id = int(os.path.basename(parts[-1])[5:10]) + 1 if parts else 0
+            self._write_part(deltas, os.path.join(self.parts_dir, f'part-{next_id:05d}{self.extension}'))
+            if len(parts) + 1 > MAX_PARTS:
+                self.compact()
+
+        tmp_path = self.watermark_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(watermark, f)
+        os.replace(tmp_path, self.watermark_path)
+        return deltas
+
+    def version(self):
+        """Identificador del contenido ingerido hasta ahora (cambia con cada lectura nueva)."""
+        watermark = self.watermark()
+        if watermark is None:
+            return None
+        estados = ','.join(watermark['estados']) if watermark.get('estados') is not None else 'todos'
+        return f"{watermark['source']}:{watermark['offset']}:{watermark.get('fingerprint', '')}:{estados}"
+
+    def _empty(self):
+        empty = pd.DataFrame({
+            'fecha': pd.Series(dtype='datetime64[ns]'),
+            'cotizaciones_por_dia': pd.Series(dtype='int64'),
+            'ventas_totales_mxn': pd.Series(dtype='float64'),
+        })
+        if self.by is not None:
+            empty.insert(0, 'serie', pd.Series(dtype='object'))
+        return empty
+
+    def _combined(self):
+        parts = [self._read_part(path) for path in self._parts()]
+        if not parts:
+            return self._empty()
+        # Un mismo día puede quedar repartido entre particiones de corridas distintas
+        combined = pd.concat(parts, ignore_index=True).groupby(self.keys, as_index=False).sum()
+        return combined.sort_values(self.keys, ignore_index=True)
+
+    def compact(self):
+        """Reescribe todas las particiones como una sola."""
+        combined = self._combined()
+        old_parts = self._parts()
+        self._write_part(combined, os.path.join(self.parts_dir, f'part-00000{self.extension}.tmp'))
+        for path in old_parts:
+            os.remove(path)
+        os.replace(os.path.join(self.parts_dir, f'part-00000{self.extension}.tmp'),
+                   os.path.join(self.parts_dir, f'part-00000{self.extension}'))
+
+    def load(self):
+        """Historia diaria con las columnas de `DAILY_COLUMNS` (precedidas por `serie` si hay `by`).
+
+        Se regresa en tipos compactos y respaldada por la historia columnar en
+        memoria mapeada, que sólo se regenera cuando cambia la versión ingerida.
+        """
+        version = self.version()
+        if version is not None and self.history.version() == version:
+            return self.history.open()
+        daily = compact_history(add_calendar_columns(self._combined()))[self.keys[:-1] + DAILY_COLUMNS]
+        if version is None:
+            return daily
+        self.history.write(daily, version)
+        return self.history.open()
@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+try:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+    from sklearn.metrics import mean_absolute_error, r2_score
+    from sklearn import __version__ as SKLEARN_VERSION
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    SKLEARN_VERSION = None
+
+    def mean_absolute_error(actual, predicted):
+        return np.mean(np.abs(np.asarray(actual) - np.asarray(predicted)))
+
+    def r2_score(actual, predicted):
+        actual, predicted = np.asarray(actual, dtype=float), np.asarray(predicted, dtype=float)
+        ss_res = np.sum((actual - predicted) ** 2)
+        ss_tot = np.sum((actual - np.mean(actual)) ** 2)
+        return 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+
+LINEAR = 'Regresión Lineal'
+RANDOM_FOREST = 'Random Forest'
+WEEKDAY_AVERAGE = 'Promedio Móvil Semanal'
+# Nombre en el reporte de un estimador elegido por la búsqueda que no es el de su familia
+TUNED_NAMES = {'Ridge': 'Regresión Ridge', 'Lasso': 'Regresión Lasso'}
+
+# Hiperparámetros por omisión del random forest (la búsqueda de tuning.py los reemplaza)
+RANDOM_FOREST_DEFAULTS = {'n_estimators': 100, 'random_state': 42}
+# Estimadores que puede elegir la búsqueda de hiperparámetros, por nombre de clase
+ESTIMATORS = {cls.__name__: cls for cls in (LinearRegression, Ridge, Lasso, RandomForestRegressor)} if SKLEARN_AVAILABLE else {}
+
+# Nivel por omisión de los intervalos de predicción
+DEFAULT_LEVEL = 0.8
+# Residuales mínimos para que un grupo use sus propios cuantiles en lugar de los globales
+MIN_GROUP_RESIDUALS = 5
+
+
+class WeekdayAverage:
+    """Promedio histórico de ventas por día de la semana.
+
+    Guarda los promedios en un arreglo de 7 posiciones para que `predict` sea un
+    solo indexado vectorizado; los días sin historia usan el promedio de los
+    promedios semanales.
+    """
+
+    def fit(self, X, y):
+        weekly_avg = y.groupby(X['dia_semana'].to_numpy()).mean()
+        self.weekly_avg_ = weekly_avg
+        self.lookup_ = np.full(7, weekly_avg.mean())
+        self.lookup_[weekly_avg.index.to_numpy(dtype=int)] = weekly_avg.to_numpy()
+        return self
+
+    def predict(self, X):
+        return self.lookup_[X['dia_semana'].to_numpy(dtype=int)]
+
+
+def tree_predictions(forest, X, start=0):
+    """Predicción de cada árbol de un `RandomForestRegressor` como matriz (árboles x filas).
+
+    Llama directamente a `tree_.predict` de cada estimador con la matriz ya
+    convertida a float32 una sola vez, sin el despacho y la validación por árbol
+    de `forest.predict`; el promedio por columna es idéntico a `forest.predict`.
+    Con `start` sólo se evalúan los árboles a partir de esa posición (los que
+    agregó un `fit` con `warm_start`).
+    """
+    X32 = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+    return np.stack([estimator.tree_.predict(X32)[:, 0] for estimator in forest.estimators_[start:]])
+
+
+def predict(model, X):
+    """`model.predict(X)`, con el camino rápido de `tree_predictions` para random forest."""
+    if SKLEARN_AVAILABLE and isinstance(model, RandomForestRegressor):
+        return tree_predictions(model, X).mean(axis=0)
+    return model.predict(X)
+
+
+def interval_quantiles(level):
+    """Cuantiles inferior y superior de un intervalo central de nivel `level`."""
+    if not 0 < level < 1:
+        raise ValueError(f"El nivel del intervalo debe estar entre 0 y 1: {level}")
+    alpha = (1 - level) / 2
+    return alpha, 1 - alpha
+
+
+class ResidualQuantiles:
+    """Intervalo por cuantiles de los residuales de entrenamiento (`y - ŷ`).
+
+    Para modelos sin dispersión propia (regresión lineal, promedios). Con
+    `groups` (día de la semana, serie) cada grupo usa sus propios cuantiles si
+    tiene al menos `MIN_GROUP_RESIDUALS` residuales; si no, los globales. Las
+    tablas por nivel se calculan una vez y después cada intervalo es un indexado.
+    """
+
+    def __init__(self, residuals, groups=None):
+        self.residuals = np.asarray(residuals, dtype='float64')
+        self.groups = None if groups is None else np.asarray(groups)
+        self._tables = {}
+
+    def _table(self, level):
+        if level not in self._tables:
+            q = list(interval_quantiles(level))
+            global_bounds = np.quantile(self.residuals, q)
+            if self.groups is None:
+                self._tables[level] = (None, global_bounds[None, :])
+            else:
+                by_group = pd.Series(self.residuals).groupby(self.groups)
+                table = by_group.quantile(q).unstack()[by_group.size() >= MIN_GROUP_RESIDUALS]
+                # La última fila es el respaldo global para grupos sin suficientes residuales
+                self._tables[level] = (table.index, np.vstack([table.to_numpy(), global_bounds]))
+        return self._tables[level]
+
+    def bounds(self, level, groups=None):
+        """Desplazamientos `(inferior, superior)` a sumar a la predicción, uno por fila de `groups`."""
+        index, bounds = self._table(level)
+        if index is None or groups is None:
+            return bounds[0, 0], bounds[0, 1]
+        rows = index.get_indexer(np.asarray(groups))
+        rows[rows < 0] = len(bounds) - 1
+        return bounds[rows, 0], bounds[rows, 1]
+
+
+def _sorted_quantile(sorted_rows, q):
+    """Cuantil `q` por columna de una matriz ya ordenada por columna (interpolación lineal)."""
+    position = q * (len(sorted_rows) - 1)
+    below = int(np.floor(position))
+    above = min(below + 1, len(sorted_rows) - 1)
+    return sorted_rows[below] + (sorted_rows[above] - sorted_rows[below]) * (position - below)
+
+
+def predict_interval(model, X, level=DEFAULT_LEVEL, residuals=None, groups=None):
+    """`(predicción, inferior, superior)` para todas las filas de `X` en una pasada.
+
+    Random forest: cuantiles sobre la matriz (árboles x filas) de `tree_predictions`.
+    Otros modelos: predicción más los cuantiles de `residuals` (`ResidualQuantiles`).
+    """
+    if SKLEARN_AVAILABLE and isinstance(model, RandomForestRegressor):
+        trees = tree_predictions(model, X)
+        point = trees.mean(axis=0)
+        # Ordenar por columna y leer las filas interpoladas es varias veces más rápido
+        # que np.quantile(axis=0) y da el mismo resultado (método lineal)
+        trees.sort(axis=0)
+        lower, upper = (_sorted_quantile(trees, q) for q in interval_quantiles(level))
+        return point, lower, upper
+    if residuals is None:
+        raise ValueError("Se requieren los residuales de entrenamiento para el intervalo")
+    point = predict(model, X)
+    lower, upper = residuals.bounds(level, groups)
+    return point, point + lower, point + upper
+
+
+def has_tree_spread(model):
+    """True si el intervalo sale de la dispersión entre árboles (no requiere residuales)."""
+    return SKLEARN_AVAILABLE and isinstance(model, RandomForestRegressor)
+
+
+def make_estimator(estimador, params):
+    """Estimador sin entrenar a partir del nombre de su clase y sus hiperparámetros."""
+    if estimador not in ESTIMATORS:
+        raise ValueError(f"Estimador desconocido: {estimador}")
+    if estimador == 'RandomForestRegressor':
+        params = {**RANDOM_FOREST_DEFAULTS, **params}
+    return ESTIMATORS[estimador](**params)
+
+
+def build_models(tuned=None):
+    """Modelos candidatos (nombre, estimador sin entrenar) en el orden del reporte.
+
+    `tuned` (`{nombre: {'estimador': clase, 'params': {...}}}`, lo que guarda
+    `tuning.save_best`) reemplaza el estimador de la regresión lineal o del
+    random forest por la mejor configuración encontrada; si es Ridge o Lasso, el
+    modelo se llama como su estimador (`TUNED_NAMES`).
+    """
+    tuned = tuned or {}
+    models = []
+    if SKLEARN_AVAILABLE:
+        for name, default in ((LINEAR, ('LinearRegression', {})), (RANDOM_FOREST, ('RandomForestRegressor', {}))):
+            best = tuned.get(name)
+            if best is None:
+                models.append((name, make_estimator(*default)))
+            else:
+                models.append((TUNED_NAMES.get(best['estimador'], name), make_estimator(best['estimador'], best['params'])))
+    models.append((WEEKDAY_AVERAGE, WeekdayAverage()))
+    return models
+
+
+def describe_model(model):
+    """Estadísticas del modelo ya entrenado para la telemetría (tamaño y parámetros aprendidos)."""
+    if SKLEARN_AVAILABLE and isinstance(model, RandomForestRegressor):
+        depths = [estimator.tree_.max_depth for estimator in model.estimators_]
+        leaves = [estimator.tree_.n_leaves for estimator in model.estimators_]
+        return {
+            'n_estimators': len(model.estimators_),
+            'mean_depth': float(np.mean(depths)),
+            'max_depth': int(np.max(depths)),
+            'mean_leaves': float(np.mean(leaves)),
+        }
+    if hasattr(model, 'coef_'):
+        return {
+            'intercept': float(np.ravel(model.intercept_)[0]),
+            'coef_l2_norm': float(np.linalg.norm(model.coef_)),
+            'nonzero_coefs': int(np.count_nonzero(model.coef_)),
+        }
+    if hasattr(model, 'lookup_'):
+        return {'weekdays_with_history': int(len(model.weekly_avg_))}
+    return {}
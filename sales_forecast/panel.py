@@ -0,0 +1,247 @@
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .features import FEATURES, calendar_features, dia_semana
+from .forecast import interval_columns
+from .models import ResidualQuantiles, WeekdayAverage, build_models, has_tree_spread, predict, predict_interval
+
+# Las features del modelo agregado más el nivel histórico de cada serie, para que
+# un solo modelo global distinga series grandes de pequeñas
+PANEL_FEATURES = FEATURES + ['serie_promedio']
+
+
+class PanelWeekdayAverage:
+    """Promedio por día de la semana de cada serie, ajustado con un solo groupby.
+
+    Los promedios quedan en una tabla (series x 7); `predict` es un indexado
+    vectorizado por `serie_codigo` y `dia_semana`. Los días sin historia usan el
+    promedio de los promedios semanales de la serie.
+    """
+
+    def fit(self, X, y):
+        codes = X['serie_codigo'].to_numpy()
+        dow = X['dia_semana'].to_numpy(dtype=int)
+        n_series = codes.max() + 1
+        means = y.groupby([codes, dow]).mean()
+        table = np.full((n_series, 7), np.nan)
+        table[means.index.get_level_values(0), means.index.get_level_values(1)] = means.to_numpy()
+        fallback = np.nanmean(table, axis=1)
+        self.lookup_ = np.where(np.isnan(table), fallback[:, None], table)
+        return self
+
+    def predict(self, X):
+        return self.lookup_[X['serie_codigo'].to_numpy(), X['dia_semana'].to_numpy(dtype=int)]
+
+
+def _set_n_jobs(model, n_jobs):
+    if hasattr(model, 'get_params') and 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+
+
+def build_panel_models(n_jobs=None):
+    """Los mismos modelos candidatos, con el promedio semanal calculado por serie."""
+    models = []
+    for name, model in build_models():
+        if isinstance(model, WeekdayAverage):
+            model = PanelWeekdayAverage()
+        else:
+            _set_n_jobs(model, n_jobs)
+        models.append((name, model))
+    return models
+
+
+def _features_for(fechas, codes, origen, cotizaciones, serie_promedio):
+    """Matriz larga (una fila por serie y fecha) sin recalcular el calendario por serie."""
+    calendar = calendar_features(fechas, origen, 0)
+    n_days = len(calendar)
+    X = calendar.iloc[np.tile(np.arange(n_days), len(codes))].reset_index(drop=True)
+    X['cotizaciones_por_dia'] = np.repeat(cotizaciones[codes], n_days)
+    X['serie_promedio'] = np.repeat(serie_promedio[codes], n_days)
+    X['serie_codigo'] = np.repeat(codes, n_days)
+    return X
+
+
+# Estado de cada proceso del pool de pronóstico
+_worker_state = {}
+
+
+def _init_worker(forecaster):
+    _worker_state['forecaster'] = forecaster
+
+
+def _forecast_shard(args):
+    codes, fechas, level = args
+    return _worker_state['forecaster']._forecast_codes(codes, fechas, level)
+
+
+class PanelForecaster:
+    """Pronóstico de miles de series cortas (producto, cliente, vendedor) con modelos globales.
+
+    Se arma una sola matriz en formato largo para todas las series; la regresión
+    lineal y el random forest se entrenan una vez sobre todo el panel, y el
+    promedio semanal por serie se calcula de forma vectorizada. El pronóstico se
+    reparte por bloques de series en un pool de procesos.
+
+    Los intervalos de predicción (`level`) salen de la misma pasada: cuantiles
+    entre árboles del random forest y cuantiles de residuales por serie (regresión
+    lineal) o por serie y día de la semana (promedio semanal).
+
+    Como en `SalesForecaster`, los modelos predicen el monto de un día *con*
+    ventas; para totales por periodo se usa `expected_forecast`.
+    """
+
+    def __init__(self, models=None, n_jobs=None):
+        self.n_jobs = n_jobs
+        self.models = models if models is not None else build_panel_models(n_jobs=-1 if n_jobs != 1 else None)
+
+    def _model_frame(self, panel):
+        codes = self.series_.get_indexer(panel['serie'])
+        X = calendar_features(panel['fecha'], self.origen_, panel['cotizaciones_por_dia'].to_numpy())
+        X['serie_promedio'] = self.serie_promedio_[codes]
+        X['serie_codigo'] = codes
+        return X
+
+    def fit(self, panel):
+        """`panel` en formato largo: `serie`, `fecha`, `cotizaciones_por_dia`, `ventas_totales_mxn`."""
+        self.origen_ = panel['fecha'].min()
+        self.series_ = pd.Index(np.sort(panel['serie'].unique()))
+        codes = self.series_.get_indexer(panel['serie'])
+        by_serie = panel.groupby(codes)
+        self.serie_promedio_ = by_serie['ventas_totales_mxn'].mean().to_numpy()
+        # Estimación de cotizaciones por día de cada serie basada en su promedio histórico
+        self.cotizaciones_ = np.maximum(1, by_serie['cotizaciones_por_dia'].mean().round().to_numpy())
+        self.sale_probability_ = self._sale_probability(panel, codes)
+
+        X = self._model_frame(panel)
+        y = panel['ventas_totales_mxn'].reset_index(drop=True)
+        self.residuals_ = {}
+        for name, model in self.models:
+            model_X = X if isinstance(model, PanelWeekdayAverage) else X[PANEL_FEATURES]
+            model.fit(model_X, y)
+            if not has_tree_spread(model):
+                self.residuals_[name] = ResidualQuantiles(y.to_numpy() - predict(model, model_X), self._interval_groups(model, X))
+        return self
+
+    def _sale_probability(self, panel, codes):
+        """P(venta | serie, día de la semana) como tabla (series x 7).
+
+        Cada serie cuenta desde su primer día con ventas hasta el último día del
+        panel, para no castigar productos o clientes que aparecieron después.
+        """
+        fechas = panel['fecha']
+        primera = fechas.groupby(codes).min()
+        ultima = fechas.max()
+        n_days = ((ultima - primera).dt.days + 1).to_numpy()
+        first_dow = dia_semana(primera).to_numpy(dtype=int)
+        # Días de calendario de cada día de la semana en [primera, ultima]
+        extra = (np.arange(7)[None, :] - first_dow[:, None]) % 7 < (n_days % 7)[:, None]
+        dias = n_days[:, None] // 7 + extra
+        dias_con_venta = np.zeros((len(self.series_), 7))
+        np.add.at(dias_con_venta, (codes, dia_semana(fechas).to_numpy(dtype=int)), 1)
+        return np.divide(dias_con_venta, dias, out=np.zeros_like(dias_con_venta), where=dias > 0)
+
+    def _interval_groups(self, model, X):
+        codes = X['serie_codigo'].to_numpy()
+        if isinstance(model, PanelWeekdayAverage):
+            return codes * 7 + X['dia_semana'].to_numpy(dtype=int)
+        return codes
+
+    def predict(self, X, level=None):
+        predictions = {}
+        for name, model in self.models:
+            model_X = X if isinstance(model, PanelWeekdayAverage) else X[PANEL_FEATURES]
+            if level is None:
+                predictions[name] = predict(model, model_X)
+                continue
+            lower_name, upper_name = interval_columns(name)
+            predictions[name], predictions[lower_name], predictions[upper_name] = predict_interval(
+                model, model_X, level, self.residuals_.get(name), self._interval_groups(model, X))
+        return pd.DataFrame(predictions, index=X.index)
+
+    def _forecast_codes(self, codes, fechas, level=None):
+        X = _features_for(fechas, codes, self.origen_, self.cotizaciones_, self.serie_promedio_)
+        predictions = self.predict(X, level)
+        predictions.insert(0, 'fecha', np.tile(fechas.to_numpy(), len(codes)))
+        predictions.insert(0, 'serie', self.series_.to_numpy()[X['serie_codigo'].to_numpy()])
+        return predictions
+
+    def forecast(self, start, end, series=None, shard_size=500, level=None):
+        """Pronóstico diario de cada modelo para cada serie y fecha en [start, end]."""
+        fechas = pd.date_range(start, end, freq='D')
+        codes = np.arange(len(self.series_)) if series is None else self.series_.get_indexer(series)
+        if (codes < 0).any():
+            raise KeyError(f"Series sin historia: {list(np.asarray(series)[codes < 0])}")
+
+        shards = [(codes[i:i + shard_size], fechas, level) for i in range(0, len(codes), shard_size)]
+        n_jobs = min(self.n_jobs or os.cpu_count() or 1, len(shards))
+        if n_jobs <= 1:
+            parts = [self._forecast_codes(*shard) for shard in shards]
+        else:
+            # Dentro de los procesos cada modelo predice con un solo hilo
+            worker_copy = copy.copy(self)
+            worker_copy.models = [(name, copy.copy(model)) for name, model in self.models]
+            for _, model in worker_copy.models:
+                _set_n_jobs(model, None)
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(worker_copy,)) as pool:
+                parts = list(pool.map(_forecast_shard, shards))
+        if not parts:
+            names = [name for name, _ in self.models]
+            if level is not None:
+                names = [column for name in names for column in (name, *interval_columns(name))]
+            return pd.DataFrame(columns=['serie', 'fecha'] + names)
+        return pd.concat(parts, ignore_index=True)
+
+    def expected_forecast(self, start, end, series=None, shard_size=500, level=None):
+        """Ventas esperadas por serie y día calendario, para sumar totales.
+
+        Cada predicción se multiplica por `probabilidad_venta` (P(venta | serie,
+        día de la semana)), que también se incluye como columna. Con `level` las
+        columnas del intervalo quedan sin ponderar: son el rango del monto en un
+        día con ventas.
+        """
+        forecast = self.forecast(start, end, series, shard_size, level)
+        codes = self.series_.get_indexer(forecast['serie'])
+        probability = self.sale_probability_[codes, dia_semana(pd.to_datetime(forecast['fecha'])).to_numpy(dtype=int)]
+        names = [name for name, _ in self.models]
+        forecast[names] = forecast[names].mul(probability, axis=0)
+        forecast.insert(2, 'probabilidad_venta', probability)
+        return forecast
+
+
+def main(argv=None):
+    import argparse
+
+    from .fx import BASE_CURRENCY, RateTable, convert_forecast
+    from .ingestion import SALE_STATES, DailySalesStore, parse_estados
+    from .pipeline import DEFAULT_CACHE_DIR
+
+    parser = argparse.ArgumentParser(description="Pronóstico por producto, cliente o vendedor")
+    parser.add_argument('export', help="Exportación de cotizaciones (CSV/JSONL/SQLite)")
+    parser.add_argument('--by', default='sku', help="Columna que define la serie (sku, cliente, vendedor_id)")
+    parser.add_argument('--days', type=int, default=90, help="Días a pronosticar después del último dato")
+    parser.add_argument('--output', default='pronostico_panel.csv')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--level', type=float, default=None, help="Nivel del intervalo de predicción (p. ej. 0.8)")
+    parser.add_argument('--moneda', default=BASE_CURRENCY, type=str.upper, help="Moneda del pronóstico (MXN, USD, EUR)")
+    parser.add_argument('--estados', default=SALE_STATES, type=parse_estados,
+                        help="Estados de cotización que cuentan como venta, separados por coma ('todos' = sin filtro)")
+    args = parser.parse_args(argv)
+
+    rates = RateTable(DEFAULT_CACHE_DIR)
+    store = DailySalesStore(os.path.join(DEFAULT_CACHE_DIR, f'panel-{args.by}'), by=args.by)
+    store.update(args.export, estados=args.estados, rates=rates)
+    panel = store.load()
+    forecaster = PanelForecaster(n_jobs=args.jobs).fit(panel)
+    inicio = panel['fecha'].max() + pd.Timedelta(days=1)
+    forecast = forecaster.expected_forecast(inicio, inicio + pd.Timedelta(days=args.days - 1), level=args.level)
+    forecast = convert_forecast(forecast, args.moneda, rates)
+    forecast.to_csv(args.output, index=False)
+    print(f"{len(forecaster.series_)} series, {len(forecast)} filas de pronóstico -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import os
+
+import pandas as pd
+
+from .aggregates import SalesAggregates
+from .backtest import DEFAULT_HORIZONS, leaderboard, run_backtest
+from .cache import ModelCache, cache_key, model_params
+from .columnar import compact_history
+from .features import FEATURES, add_features
+from .forecast import SalesForecaster
+from .fx import RateTable
+from .ingestion import SALE_STATES, DailySalesStore
+from .models import SKLEARN_VERSION, build_models
+from .sample_data import sales_data
+from .telemetry import RunTelemetry
+
+# Caché columnar de la historia diaria, estado de reportes y modelos entrenados
+DEFAULT_CACHE_DIR = os.environ.get('SALES_CACHE_DIR', '.sales_cache')
+# Cambia cuando el contenido guardado de los modelos entrenados cambia de forma
+MODEL_CACHE_FORMAT = 3
+# Cambia cuando `add_features` cambia las columnas o sus tipos
+FEATURES_FORMAT = 2
+
+
+def load_history(source=None, cache_dir=DEFAULT_CACHE_DIR, telemetry=None, rates=None, estados=SALE_STATES):
+    """Carga la historia diaria y pone al día el estado incremental de los reportes.
+
+    `source` es una exportación de cotizaciones (CSV/JSONL/SQLite); sin ella se
+    usan los datos embebidos. Las cotizaciones en otras monedas se convierten a
+    pesos con `rates` (`fx.RateTable`) y sólo cuentan las cotizaciones en
+    `estados` (`None` = todas). Regresa `(df, aggregates, new_days)`.
+    """
+    telemetry = telemetry if telemetry is not None else RunTelemetry()
+    rates = rates if rates is not None else RateTable(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    aggregates_path = os.path.join(cache_dir, 'aggregates.json')
+    if source is not None:
+        store = DailySalesStore(cache_dir)
+        base_version = store.version()
+        with telemetry.stage('ingesta') as record:
+            deltas = store.update(source, estados=estados, rates=rates)
+            df = store.load()
+            record.update(rows=len(df), new_days=len(deltas), rebuilt=store.rebuilt)
+        if df.empty:
+            raise ValueError(f"{source} no tiene cotizaciones en los estados {', '.join(estados or ())}; "
+                             f"usa --estados para elegir otros (o 'todos')")
+        # Estado incremental de los reportes: sólo se aplican los días recién ingeridos
+        with telemetry.stage('agregados', rows=len(deltas)):
+            aggregates = SalesAggregates.sync(aggregates_path, df, store.version(), deltas, None if store.rebuilt else base_version)
+        return df, aggregates, len(deltas)
+
+    with telemetry.stage('ingesta') as record:
+        df = pd.DataFrame(sales_data)
+        df['fecha'] = pd.to_datetime(df['fecha'])
+        df = compact_history(df)
+        record['rows'] = len(df)
+    with telemetry.stage('agregados', rows=len(df)):
+        aggregates = SalesAggregates.sync(aggregates_path, df, cache_key(df, []))
+    return df, aggregates, 0
+
+
+def train_models(df, cache_dir=DEFAULT_CACHE_DIR, new_days=0, telemetry=None):
+    """Backtest y modelos finales, desde la caché si los datos no cambiaron.
+
+    Regresa `(forecaster, backtest_results, cache_hit)`; las estadísticas de
+    ajuste y backtest de cada modelo quedan en `telemetry` (con `fit_cached` y
+    sin `fit_seconds` si los modelos vinieron de la caché). Si hay una búsqueda
+    de hiperparámetros guardada (`python -m sales_forecast.tuning`), se usa su
+    mejor configuración.
+    """
+    # Import diferido: tuning.py también se ejecuta como módulo (python -m)
+    from .tuning import load_best
+
+    telemetry = telemetry if telemetry is not None else RunTelemetry()
+    model_cache = ModelCache(os.path.join(cache_dir, 'models'))
+    if new_days:
+        model_cache.invalidate()
+    tuned = load_best(cache_dir)
+    cache_params = {'models': model_params(build_models(tuned)), 'horizons': DEFAULT_HORIZONS, 'sklearn': SKLEARN_VERSION,
+                    'format': MODEL_CACHE_FORMAT}
+
+    # Crear características para el modelo
+    with telemetry.stage('caracteristicas', rows=len(df)) as record:
+        df_model, record['cache_hit'] = model_cache.get_or_compute(cache_key(df, FEATURES, {'format': FEATURES_FORMAT}),
+                                                                 lambda: add_features(df))
+
+    def train():
+        # Backtest con origen móvil: cada modelo se evalúa sobre muchos orígenes y horizontes
+        with telemetry.stage('backtest', rows=len(df_model)):
+            backtest_results = run_backtest(df_model, build_models(tuned))
+        # Modelos finales entrenados con toda la historia
+        with telemetry.stage('ajuste', rows=len(df_model)):
+            forecaster = SalesForecaster(build_models(tuned)).fit(df_model)
+        return {'backtest_results': backtest_results, 'forecaster': forecaster}
+
+    with telemetry.stage('entrenamiento', rows=len(df_model)) as record:
+        trained, cache_hit = model_cache.get_or_compute(cache_key(df, FEATURES, cache_params), train)
+        record['cache_hit'] = cache_hit
+    forecaster, backtest_results = trained['forecaster'], trained['backtest_results']
+
+    telemetry.info['cache_hit'] = cache_hit
+    telemetry.info['tuned'] = tuned is not None
+    for name, stats in getattr(forecaster, 'fit_stats_', {}).items():
+        if cache_hit:
+            # El tiempo de ajuste es de la corrida que llenó la caché, no de ésta
+            stats = dict({key: value for key, value in stats.items() if key != 'fit_seconds'}, fit_cached=True)
+        telemetry.record_model(name, **stats)
+    for row in leaderboard(backtest_results).itertuples():
+        telemetry.record_model(row.modelo, backtest_mae=row.mae, backtest_mae_std=row.mae_std,
+                               backtest_r2=row.r2, backtest_folds=row.pliegues)
+    return forecaster, backtest_results, cache_hit
@@ -0,0 +1,201 @@
+import sys
+import warnings
+
+import pandas as pd
+
+from .backtest import DEFAULT_HORIZONS, leaderboard
+from .aggregates import SalesAggregates
+from .forecast import interval_columns
+from .fx import BASE_CURRENCY, MissingRateError, RateTable, convert_forecast, convert_history
+from .ingestion import SALE_STATES, parse_estados
+from .models import DEFAULT_LEVEL, SKLEARN_AVAILABLE
+from .pipeline import DEFAULT_CACHE_DIR, load_history, train_models
+from .telemetry import RunTelemetry
+
+
+def print_report(df, aggregates, forecaster, backtest_results, telemetry, moneda=BASE_CURRENCY, rates=None):
+    """Reporte de patrones de ventas, comparación de modelos y predicción.
+
+    Lo relativo al entrenamiento (caché, tiempos de ajuste) se toma de la
+    telemetría de la corrida. Con `moneda` distinta de MXN, la historia se
+    convierte día por día con el FIX as-of de `rates` y los pronósticos con el de
+    cada fecha pronosticada (el último publicado para fechas futuras).
+    """
+    if moneda != BASE_CURRENCY:
+        # Los reportes en otra moneda se calculan sobre la historia convertida
+        aggregates = SalesAggregates.from_history(convert_history(df, moneda, rates))
+        fix_actual = rates.asof([df['fecha'].max() + pd.Timedelta(days=1)], moneda)[0]
+    else:
+        fix_actual = 1.0
+
+    # Años que cubre la historia (p. ej. "2025" o "2024-2025")
+    first_year, last_year = aggregates.first_date.year, aggregates.last_date.year
+    anios = str(first_year) if first_year == last_year else f"{first_year}-{last_year}"
+
+    # Análisis de patrones y estacionalidad
+    print(f"=== ANÁLISIS DE PATRONES DE VENTAS FUNNY KITCHEN {anios} ===\n")
+
+    # Estadísticas básicas
+    resumen = aggregates.range_summary()
+    print("1. ESTADÍSTICAS GENERALES:")
+    print(f"Total de días con ventas: {resumen['dias']}")
+    print(f"Rango de fechas: {aggregates.first_date.strftime('%Y-%m-%d')} a {aggregates.last_date.strftime('%Y-%m-%d')}")
+    print(f"Total de cotizaciones: {resumen['cotizaciones']}")
+    print(f"Ventas totales {anios}: ${resumen['ventas']:,.2f} {moneda}")
+    print(f"Promedio diario: ${resumen['promedio']:,.2f} {moneda}")
+    # La mediana sale del sketch de cuantiles (error relativo acotado), no es exacta
+    print(f"Mediana diaria: ≈${aggregates.quantile(0.5):,.0f} {moneda}")
+
+    # Análisis por mes (todos los meses y años presentes en la historia)
+    print("\n2. VENTAS POR MES:")
+    print("Mes     | Ventas Totales | Promedio Diario | Días con Ventas | Cotizaciones")
+    for row in aggregates.monthly_report().itertuples():
+        print(f"{row.anio}-{row.mes:02d} | ${row.ventas:13,.0f} | ${row.promedio:14,.0f} | {row.dias:15d} | {row.cotizaciones:12d}")
+
+    # Análisis por día de la semana
+    dias_semana = ['Domingo', 'Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado']
+    print("\n3. PATRÓN SEMANAL:")
+    print("Día Semana    | Promedio Ventas | Días | Cotizaciones Prom")
+    for row in aggregates.weekday_report().itertuples():
+        print(f"{dias_semana[row.dia_semana]:12} | ${row.promedio:13,.0f} | {row.dias:4d} | {row.cotizaciones_promedio:14.1f}")
+
+    # Análisis de marzo específicamente
+    marzo = aggregates.month_of_year_summary(3)
+    print("\n4. ANÁLISIS ESPECÍFICO DE MARZO:")
+    print(f"Días con ventas en marzo: {marzo['dias']}")
+    print(f"Total ventas marzo: ${marzo['ventas']:,.2f} {moneda}")
+    print(f"Promedio diario marzo: ${marzo['promedio']:,.2f} {moneda}")
+    print(f"Total cotizaciones marzo: {marzo['cotizaciones']}")
+
+    # Datos históricos del 26 de marzo
+    marzo_26_historico = [
+        (anio, aggregates.day(f'{anio}-03-26'))
+        for anio in range(aggregates.first_date.year, aggregates.last_date.year + 1)
+    ]
+    marzo_26_historico = [(anio, dia) for anio, dia in marzo_26_historico if dia is not None]
+    if marzo_26_historico:
+        print(f"\n5. HISTÓRICO 26 DE MARZO:")
+        for anio, (cotizaciones, ventas) in marzo_26_historico:
+            print(f"{anio}-03-26: {cotizaciones} cotizaciones, ${ventas:,.2f} {moneda}")
+
+    # Preparar datos para algoritmos de predicción
+    print("\n6. PREPARACIÓN DE MODELOS DE PREDICCIÓN:")
+    if telemetry.info.get('tuned'):
+        print("Hiperparámetros de la última búsqueda guardada (python -m sales_forecast.tuning)")
+
+    if telemetry.info.get('cache_hit'):
+        print("\nModelos y métricas cargados de caché (sin reentrenar)")
+    else:
+        if not SKLEARN_AVAILABLE:
+            print("\nUsando métodos básicos de predicción...")
+        print()
+        for name, stats in telemetry.models.items():
+            if 'fit_seconds' in stats:
+                print(f"Entrenado {name}: {stats['fit_seconds']:.2f} s con {stats['train_rows']} días")
+    board = leaderboard(backtest_results)
+
+    fitted = dict(forecaster.models)
+    models = [(row.modelo, fitted[row.modelo], row.mae / fix_actual, row.r2) for row in board.itertuples()]
+
+    print("\n7. COMPARACIÓN DE MODELOS:")
+    print(f"Backtest walk-forward: {backtest_results['origen'].nunique()} orígenes, "
+          f"horizontes de {', '.join(str(h) for h in DEFAULT_HORIZONS)} días con ventas")
+    if moneda != BASE_CURRENCY:
+        print(f"MAE convertido con el FIX más reciente: {fix_actual:,.4f} MXN/{moneda}")
+    print("Modelo                    | MAE          | R²")
+    for name, _, model_mae, model_r2 in models:
+        print(f"{name:25} | ${model_mae:10,.0f} | {model_r2:6.3f}")
+
+    best_model = min(models, key=lambda x: x[2])
+    print(f"\nMEJOR MODELO: {best_model[0]} (MAE: ${best_model[2]:,.0f})")
+
+    # Predicción para marzo 26, 2026
+    print("\n8. PREDICCIÓN PARA 26 DE MARZO 2026:")
+    pronostico_26 = convert_forecast(forecaster.forecast('2026-03-26', '2026-03-26', models=[best_model[0]], level=DEFAULT_LEVEL),
+                                     moneda, rates).iloc[0]
+    prediction = pronostico_26[best_model[0]]
+    inferior, superior = (pronostico_26[column] for column in interval_columns(best_model[0]))
+
+    # Cálculos adicionales
+    marzo_historical_avg = marzo['promedio']
+    dia_26_historico = marzo_26_historico[-1] if marzo_26_historico else None
+
+    print(f"Algoritmo seleccionado: {best_model[0]}")
+    print(f"Predicción para 2026-03-26: ${prediction:,.0f} {moneda}")
+    print(f"Promedio histórico marzo: ${marzo_historical_avg:,.0f} {moneda}")
+    if dia_26_historico:
+        print(f"Valor histórico {dia_26_historico[0]}-03-26: ${dia_26_historico[1][1]:,.0f} {moneda}")
+
+    # Intervalo de predicción del modelo seleccionado
+    print(f"\nIntervalo de predicción ({DEFAULT_LEVEL:.0%}): ${inferior:,.0f} - ${superior:,.0f} {moneda}")
+
+    # Pronóstico diario para planeación de flujo de efectivo
+    FORECAST_DAYS = 90
+    inicio_horizonte = df['fecha'].max() + pd.Timedelta(days=1)
+    # Ventas esperadas por día calendario (ponderadas por la probabilidad de vender ese día de la semana)
+    horizonte = convert_forecast(forecaster.expected_forecast(inicio_horizonte, inicio_horizonte + pd.Timedelta(days=FORECAST_DAYS - 1)),
+                                 moneda, rates)
+    por_mes = horizonte.groupby(horizonte['fecha'].dt.to_period('M'))[best_model[0]].sum()
+    print(f"\n9. PRONÓSTICO PRÓXIMOS {FORECAST_DAYS} DÍAS ({best_model[0]}):")
+    for periodo, total in por_mes.items():
+        print(f"{periodo}: ${total:,.0f} {moneda}")
+
+    print("\n=== RESUMEN EJECUTIVO ===")
+    print(f"Para el 26 de marzo de 2026, el modelo {best_model[0]} predice:")
+    print(f"Ventas esperadas: ${prediction:,.0f} {moneda}")
+    print(f"Rango probable ({DEFAULT_LEVEL:.0%}): ${inferior:,.0f} - ${superior:,.0f} {moneda}")
+    print(f"Basado en {len(df)} días de datos históricos de {anios}")
+
+
+def print_stage_times(telemetry):
+    """Tiempos por etapa de la corrida (otro consumidor de la telemetría)."""
+    print("\n=== TIEMPOS POR ETAPA ===")
+    print("Etapa                     | Reloj (s) | CPU (s)  | Filas")
+    for record in telemetry.stages:
+        name = record['stage'] if record['parent'] is None else f"  {record['stage']}"
+        rows = '' if record.get('rows') is None else f"{record['rows']:,}"
+        print(f"{name:25} | {record['wall_s']:9.2f} | {record['cpu_s']:8.2f} | {rows}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Análisis y predicción de ventas de Funny Kitchen")
+    parser.add_argument('source', nargs='?', default=None, help="Exportación de cotizaciones (CSV/JSONL/SQLite); por omisión los datos embebidos")
+    parser.add_argument('--moneda', default=BASE_CURRENCY, type=str.upper, help="Moneda del reporte (MXN, USD, EUR)")
+    parser.add_argument('--estados', default=SALE_STATES, type=parse_estados,
+                        help="Estados de cotización que cuentan como venta, separados por coma ('todos' = sin filtro)")
+    parser.add_argument('--telemetry', metavar='JSON', help="Escribe la telemetría de la corrida en JSON")
+    parser.add_argument('--metrics', metavar='PROM', help="Escribe la telemetría en formato OpenMetrics")
+    parser.add_argument('--profile', metavar='ETAPAS', help="Etapas a perfilar con cProfile ('*' = todas)")
+    parser.add_argument('--trace-memory', metavar='ETAPAS', help="Etapas a medir con tracemalloc ('*' = todas)")
+    parser.add_argument('--profile-dir', default=DEFAULT_CACHE_DIR, help="Directorio de los archivos .prof")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings('ignore')
+    if not SKLEARN_AVAILABLE:
+        print("Sklearn no disponible - usando métodos básicos de predicción")
+
+    telemetry = RunTelemetry(profile=args.profile, trace_memory=args.trace_memory, profile_dir=args.profile_dir)
+    # Crear DataFrame: desde una exportación de cotizaciones (CSV/JSONL/SQLite) si se indica,
+    # o desde los datos embebidos
+    rates = RateTable(DEFAULT_CACHE_DIR)
+    try:
+        df, aggregates, new_days = load_history(args.source, DEFAULT_CACHE_DIR, telemetry, rates, args.estados)
+        forecaster, backtest_results, _ = train_models(df, DEFAULT_CACHE_DIR, new_days, telemetry)
+        with telemetry.stage('reporte'):
+            print_report(df, aggregates, forecaster, backtest_results, telemetry, args.moneda, rates)
+    except MissingRateError as exc:
+        print(f"\nError: {exc}.\nDefine BANXICO_TOKEN para consultar los tipos de cambio de Banxico, "
+              f"o BANXICO_RATES_FILE con un CSV fecha,moneda,tipo_cambio para correr sin red.", file=sys.stderr)
+        sys.exit(1)
+    print_stage_times(telemetry)
+
+    if args.telemetry:
+        telemetry.write_json(args.telemetry)
+    if args.metrics:
+        telemetry.write_openmetrics(args.metrics)
+
+
+if __name__ == '__main__':
+    main()
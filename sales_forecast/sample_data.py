@@ -0,0 +1,101 @@
+# Datos de ventas extraídos de la base de datos
+sales_data = [
+    {"fecha": "2025-01-02", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 325380.00, "mes": 1, "dia_semana": 4, "dia_mes": 2},
+    {"fecha": "2025-01-03", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 70064.00, "mes": 1, "dia_semana": 5, "dia_mes": 3},
+    {"fecha": "2025-01-06", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 2830.40, "mes": 1, "dia_semana": 1, "dia_mes": 6},
+    {"fecha": "2025-01-07", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 55847.04, "mes": 1, "dia_semana": 2, "dia_mes": 7},
+    {"fecha": "2025-01-10", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 84680.00, "mes": 1, "dia_semana": 5, "dia_mes": 10},
+    {"fecha": "2025-01-15", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 4287.36, "mes": 1, "dia_semana": 3, "dia_mes": 15},
+    {"fecha": "2025-01-17", "cotizaciones_por_dia": 4, "ventas_totales_mxn": 115868.54, "mes": 1, "dia_semana": 5, "dia_mes": 17},
+    {"fecha": "2025-01-20", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 40110.48, "mes": 1, "dia_semana": 1, "dia_mes": 20},
+    {"fecha": "2025-01-24", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 30537.00, "mes": 1, "dia_semana": 5, "dia_mes": 24},
+    {"fecha": "2025-01-25", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 29974.40, "mes": 1, "dia_semana": 6, "dia_mes": 25},
+    {"fecha": "2025-01-27", "cotizaciones_por_dia": 5, "ventas_totales_mxn": 110932.61, "mes": 1, "dia_semana": 1, "dia_mes": 27},
+    {"fecha": "2025-01-28", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 56215.00, "mes": 1, "dia_semana": 2, "dia_mes": 28},
+    {"fecha": "2025-01-29", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 54747.07, "mes": 1, "dia_semana": 3, "dia_mes": 29},
+    {"fecha": "2025-01-30", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 38241.73, "mes": 1, "dia_semana": 4, "dia_mes": 30},
+    {"fecha": "2025-01-31", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 2816.03, "mes": 1, "dia_semana": 5, "dia_mes": 31},
+    {"fecha": "2025-02-05", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 93648.00, "mes": 2, "dia_semana": 3, "dia_mes": 5},
+    {"fecha": "2025-02-06", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 54856.00, "mes": 2, "dia_semana": 4, "dia_mes": 6},
+    {"fecha": "2025-02-10", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 18038.96, "mes": 2, "dia_semana": 1, "dia_mes": 10},
+    {"fecha": "2025-02-12", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 35461.20, "mes": 2, "dia_semana": 3, "dia_mes": 12},
+    {"fecha": "2025-02-13", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 66990.00, "mes": 2, "dia_semana": 4, "dia_mes": 13},
+    {"fecha": "2025-02-14", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 33686.40, "mes": 2, "dia_semana": 5, "dia_mes": 14},
+    {"fecha": "2025-02-18", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 96160.09, "mes": 2, "dia_semana": 2, "dia_mes": 18},
+    {"fecha": "2025-02-19", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 11484.00, "mes": 2, "dia_semana": 3, "dia_mes": 19},
+    {"fecha": "2025-02-20", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 39277.60, "mes": 2, "dia_semana": 4, "dia_mes": 20},
+    {"fecha": "2025-02-24", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 48720.00, "mes": 2, "dia_semana": 1, "dia_mes": 24},
+    {"fecha": "2025-02-25", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 14061.52, "mes": 2, "dia_semana": 2, "dia_mes": 25},
+    {"fecha": "2025-02-26", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 10440.00, "mes": 2, "dia_semana": 3, "dia_mes": 26},
+    {"fecha": "2025-03-01", "cotizaciones_por_dia": 4, "ventas_totales_mxn": 245826.24, "mes": 3, "dia_semana": 6, "dia_mes": 1},
+    {"fecha": "2025-03-05", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 36431.00, "mes": 3, "dia_semana": 3, "dia_mes": 5},
+    {"fecha": "2025-03-06", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 28150.00, "mes": 3, "dia_semana": 4, "dia_mes": 6},
+    {"fecha": "2025-03-08", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 22304.48, "mes": 3, "dia_semana": 6, "dia_mes": 8},
+    {"fecha": "2025-03-10", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 80736.00, "mes": 3, "dia_semana": 1, "dia_mes": 10},
+    {"fecha": "2025-03-12", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 37231.00, "mes": 3, "dia_semana": 3, "dia_mes": 12},
+    {"fecha": "2025-03-13", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 38520.12, "mes": 3, "dia_semana": 4, "dia_mes": 13},
+    {"fecha": "2025-03-20", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 46980.00, "mes": 3, "dia_semana": 4, "dia_mes": 20},
+    {"fecha": "2025-03-21", "cotizaciones_por_dia": 4, "ventas_totales_mxn": 165840.75, "mes": 3, "dia_semana": 5, "dia_mes": 21},
+    {"fecha": "2025-03-25", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 32176.08, "mes": 3, "dia_semana": 2, "dia_mes": 25},
+    {"fecha": "2025-03-26", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 100346.40, "mes": 3, "dia_semana": 3, "dia_mes": 26},
+    {"fecha": "2025-03-28", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 57239.04, "mes": 3, "dia_semana": 5, "dia_mes": 28},
+    {"fecha": "2025-03-31", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 23490.00, "mes": 3, "dia_semana": 1, "dia_mes": 31},
+    {"fecha": "2025-04-02", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 68237.00, "mes": 4, "dia_semana": 3, "dia_mes": 2},
+    {"fecha": "2025-04-11", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 36500.00, "mes": 4, "dia_semana": 5, "dia_mes": 11},
+    {"fecha": "2025-04-15", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 45490.33, "mes": 4, "dia_semana": 2, "dia_mes": 15},
+    {"fecha": "2025-04-16", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 50417.36, "mes": 4, "dia_semana": 3, "dia_mes": 16},
+    {"fecha": "2025-04-22", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 172591.57, "mes": 4, "dia_semana": 2, "dia_mes": 22},
+    {"fecha": "2025-04-25", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 78330.00, "mes": 4, "dia_semana": 5, "dia_mes": 25},
+    {"fecha": "2025-04-29", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 150497.60, "mes": 4, "dia_semana": 2, "dia_mes": 29},
+    {"fecha": "2025-04-30", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 6344.40, "mes": 4, "dia_semana": 3, "dia_mes": 30},
+    {"fecha": "2025-05-01", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 39448.19, "mes": 5, "dia_semana": 4, "dia_mes": 1},
+    {"fecha": "2025-05-12", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 35082.96, "mes": 5, "dia_semana": 1, "dia_mes": 12},
+    {"fecha": "2025-05-13", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 308524.00, "mes": 5, "dia_semana": 2, "dia_mes": 13},
+    {"fecha": "2025-05-14", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 16192.00, "mes": 5, "dia_semana": 3, "dia_mes": 14},
+    {"fecha": "2025-05-15", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 98837.00, "mes": 5, "dia_semana": 4, "dia_mes": 15},
+    {"fecha": "2025-05-17", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 37819.76, "mes": 5, "dia_semana": 6, "dia_mes": 17},
+    {"fecha": "2025-05-20", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 72973.36, "mes": 5, "dia_semana": 2, "dia_mes": 20},
+    {"fecha": "2025-05-21", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 20256.80, "mes": 5, "dia_semana": 3, "dia_mes": 21},
+    {"fecha": "2025-05-22", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 79726.00, "mes": 5, "dia_semana": 4, "dia_mes": 22},
+    {"fecha": "2025-05-23", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 69969.00, "mes": 5, "dia_semana": 5, "dia_mes": 23},
+    {"fecha": "2025-05-26", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 38628.00, "mes": 5, "dia_semana": 1, "dia_mes": 26},
+    {"fecha": "2025-05-28", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 23490.00, "mes": 5, "dia_semana": 3, "dia_mes": 28},
+    {"fecha": "2025-05-29", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 51040.00, "mes": 5, "dia_semana": 4, "dia_mes": 29},
+    {"fecha": "2025-06-02", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 45232.20, "mes": 6, "dia_semana": 1, "dia_mes": 2},
+    {"fecha": "2025-06-03", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 140983.28, "mes": 6, "dia_semana": 2, "dia_mes": 3},
+    {"fecha": "2025-06-04", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 41887.60, "mes": 6, "dia_semana": 3, "dia_mes": 4},
+    {"fecha": "2025-06-11", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 66874.00, "mes": 6, "dia_semana": 3, "dia_mes": 11},
+    {"fecha": "2025-06-12", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 32310.80, "mes": 6, "dia_semana": 4, "dia_mes": 12},
+    {"fecha": "2025-06-13", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 320414.00, "mes": 6, "dia_semana": 5, "dia_mes": 13},
+    {"fecha": "2025-06-16", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 16660.88, "mes": 6, "dia_semana": 1, "dia_mes": 16},
+    {"fecha": "2025-06-17", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 4453.00, "mes": 6, "dia_semana": 2, "dia_mes": 17},
+    {"fecha": "2025-06-19", "cotizaciones_por_dia": 5, "ventas_totales_mxn": 130826.92, "mes": 6, "dia_semana": 4, "dia_mes": 19},
+    {"fecha": "2025-06-20", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 20040.32, "mes": 6, "dia_semana": 5, "dia_mes": 20},
+    {"fecha": "2025-06-23", "cotizaciones_por_dia": 4, "ventas_totales_mxn": 30262.16, "mes": 6, "dia_semana": 1, "dia_mes": 23},
+    {"fecha": "2025-06-24", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 20390.04, "mes": 6, "dia_semana": 2, "dia_mes": 24},
+    {"fecha": "2025-06-25", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 17325.40, "mes": 6, "dia_semana": 3, "dia_mes": 25},
+    {"fecha": "2025-06-26", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 52432.00, "mes": 6, "dia_semana": 4, "dia_mes": 26},
+    {"fecha": "2025-06-27", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 147097.64, "mes": 6, "dia_semana": 5, "dia_mes": 27},
+    {"fecha": "2025-06-28", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 13302.40, "mes": 6, "dia_semana": 6, "dia_mes": 28},
+    {"fecha": "2025-06-29", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 9466.00, "mes": 6, "dia_semana": 0, "dia_mes": 29},
+    {"fecha": "2025-06-30", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 75637.00, "mes": 6, "dia_semana": 1, "dia_mes": 30},
+    {"fecha": "2025-07-01", "cotizaciones_por_dia": 6, "ventas_totales_mxn": 60581.40, "mes": 7, "dia_semana": 2, "dia_mes": 1},
+    {"fecha": "2025-07-02", "cotizaciones_por_dia": 9, "ventas_totales_mxn": 310353.52, "mes": 7, "dia_semana": 3, "dia_mes": 2},
+    {"fecha": "2025-07-04", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 4517.20, "mes": 7, "dia_semana": 5, "dia_mes": 4},
+    {"fecha": "2025-07-07", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 93606.40, "mes": 7, "dia_semana": 1, "dia_mes": 7},
+    {"fecha": "2025-07-09", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 34210.80, "mes": 7, "dia_semana": 3, "dia_mes": 9},
+    {"fecha": "2025-07-10", "cotizaciones_por_dia": 3, "ventas_totales_mxn": 69910.80, "mes": 7, "dia_semana": 4, "dia_mes": 10},
+    {"fecha": "2025-07-11", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 20374.40, "mes": 7, "dia_semana": 5, "dia_mes": 11},
+    {"fecha": "2025-07-12", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 23556.00, "mes": 7, "dia_semana": 6, "dia_mes": 12},
+    {"fecha": "2025-07-14", "cotizaciones_por_dia": 4, "ventas_totales_mxn": 356440.28, "mes": 7, "dia_semana": 1, "dia_mes": 14},
+    {"fecha": "2025-07-15", "cotizaciones_por_dia": 4, "ventas_totales_mxn": 402162.67, "mes": 7, "dia_semana": 2, "dia_mes": 15},
+    {"fecha": "2025-07-16", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 15400.00, "mes": 7, "dia_semana": 3, "dia_mes": 16},
+    {"fecha": "2025-07-17", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 17792.00, "mes": 7, "dia_semana": 4, "dia_mes": 17},
+    {"fecha": "2025-07-18", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 26227.00, "mes": 7, "dia_semana": 5, "dia_mes": 18},
+    {"fecha": "2025-07-22", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 244090.24, "mes": 7, "dia_semana": 2, "dia_mes": 22},
+    {"fecha": "2025-07-23", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 9452.00, "mes": 7, "dia_semana": 3, "dia_mes": 23},
+    {"fecha": "2025-07-26", "cotizaciones_por_dia": 2, "ventas_totales_mxn": 22990.00, "mes": 7, "dia_semana": 6, "dia_mes": 26},
+    {"fecha": "2025-07-28", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 42189.99, "mes": 7, "dia_semana": 1, "dia_mes": 28},
+    {"fecha": "2025-07-29", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 19392.00, "mes": 7, "dia_semana": 2, "dia_mes": 29},
+    {"fecha": "2025-08-04", "cotizaciones_por_dia": 1, "ventas_totales_mxn": 29008.00, "mes": 8, "dia_semana": 1, "dia_mes": 4}
+]
@@ -0,0 +1,395 @@
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from .backtest import leaderboard
+from .forecast import interval_columns
+from .fx import BANXICO_SERIES, BASE_CURRENCY, RateTable, convert_forecast
+from .ingestion import SALE_STATES, parse_estados
+from .pipeline import DEFAULT_CACHE_DIR, load_history, train_models
+from .telemetry import RunTelemetry
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_BATCH = 256
+MAX_WAIT_SECONDS = 0.002
+MAX_HORIZON_DAYS = 3660
+PRECOMPUTED_DAYS = 730
+REQUEST_TIMEOUT_SECONDS = 30
+ALL_MODELS = 'todos'
+
+
+class ModelSnapshot:
+    """Modelos entrenados de una versión de los datos; no se modifica después de publicarse.
+
+    Al crearse pronostica de una vez (una llamada a `predict` por modelo) desde el
+    inicio de la historia hasta `precomputed_days` después del último dato, con
+    las cotizaciones por día estimadas; las peticiones dentro de ese rango son un
+    corte de arreglos en memoria.
+    """
+
+    def __init__(self, forecaster, backtest_results, version, first_date, last_date, precomputed_days=PRECOMPUTED_DAYS):
+        self.forecaster = forecaster
+        self.leaderboard = leaderboard(backtest_results)
+        self.best_model = self.leaderboard['modelo'].iloc[0]
+        self.model_names = [name for name, _ in forecaster.models]
+        self.version = version
+        self.trained_at = time.time()
+        table = forecaster.forecast(first_date, last_date + pd.Timedelta(days=precomputed_days))
+        self.table_start = table['fecha'].iloc[0]
+        self.table_fechas = table['fecha'].to_numpy()
+        self.table = {name: table[name].to_numpy() for name in self.model_names}
+
+    def requested_models(self, modelo):
+        requested = self.model_names if modelo == ALL_MODELS else [modelo or self.best_model]
+        if requested[0] not in self.model_names:
+            raise ValueError(f"Modelo desconocido: {modelo}. Opciones: {', '.join(self.model_names)}, {ALL_MODELS}")
+        return requested
+
+    def lookup(self, fechas, modelo=None):
+        """Predicciones precalculadas para `fechas` consecutivas, o None si salen del rango."""
+        start = (fechas[0] - self.table_start).days
+        stop = start + len(fechas)
+        if start < 0 or stop > len(self.table_fechas):
+            return None
+        columns = {'fecha': self.table_fechas[start:stop]}
+        for name in self.requested_models(modelo):
+            columns[name] = self.table[name][start:stop]
+        return pd.DataFrame(columns)
+
+
+class ModelRegistry:
+    """Snapshot de modelos servido actualmente.
+
+    Publicar una versión nueva sólo reemplaza una referencia, así que las
+    peticiones en curso terminan con el snapshot que ya tenían.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = None
+
+    def swap(self, snapshot):
+        with self._lock:
+            previous, self._current = self._current, snapshot
+        return previous
+
+    def current(self):
+        with self._lock:
+            return self._current
+
+
+class MicroBatcher:
+    """Junta peticiones concurrentes de pronóstico en una sola llamada a `predict` por modelo.
+
+    Un hilo toma la primera petición de la cola y espera hasta `max_wait`
+    segundos por más (máximo `max_batch`); luego arma una sola matriz con todas
+    las fechas pedidas y reparte los resultados a cada petición.
+    """
+
+    def __init__(self, registry, max_batch=MAX_BATCH, max_wait=MAX_WAIT_SECONDS):
+        self.registry = registry
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='forecast-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, fechas, cotizaciones=None, modelo=None):
+        """Encola una petición; el `Future` resuelve a `(snapshot, predicciones)`.
+
+        `modelo` es un nombre de modelo, `ALL_MODELS`, o None para el mejor modelo
+        del snapshot con el que se atienda la petición.
+        """
+        future = Future()
+        self._queue.put((pd.DatetimeIndex(fechas), cotizaciones, modelo, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._process(batch)
+
+    def _process(self, batch):
+        snapshot = self.registry.current()
+        if snapshot is None:
+            for *_, future in batch:
+                future.set_exception(RuntimeError("No hay modelos entrenados todavía"))
+            return
+
+        # Cada petición pide uno o todos los modelos; sólo se evalúan los que alguien pidió
+        valid = []
+        for request_fechas, cotizaciones, modelo, future in batch:
+            try:
+                valid.append((request_fechas, cotizaciones, snapshot.requested_models(modelo), future))
+            except ValueError as exc:
+                future.set_exception(exc)
+        if not valid:
+            return
+
+        forecaster = snapshot.forecaster
+        try:
+            fechas = pd.DatetimeIndex(np.concatenate([request[0].to_numpy() for request in valid]))
+            cotizaciones = np.concatenate([
+                np.full(len(request[0]), forecaster.cotizaciones_ if request[1] is None else request[1])
+                for request in valid
+            ])
+            models = {name for request in valid for name in request[2]}
+            predictions = forecaster.forecast_dates(fechas, cotizaciones, models)
+        except Exception as exc:
+            for *_, future in valid:
+                future.set_exception(exc)
+            return
+
+        offset = 0
+        for request_fechas, _, requested, future in valid:
+            part = predictions.iloc[offset:offset + len(request_fechas)][['fecha'] + requested]
+            offset += len(request_fechas)
+            future.set_result((snapshot, part.reset_index(drop=True)))
+
+
+def history_source(source=None, cache_dir=DEFAULT_CACHE_DIR, estados=SALE_STATES):
+    """Fuente de datos del servicio: exportación local (o datos embebidos) vía la caché de ingestión."""
+    def load():
+        df, _, new_days = load_history(source, cache_dir, estados=estados)
+        return df, new_days
+    return load
+
+
+class ForecastService:
+    """Servicio de pronóstico con modelos en memoria.
+
+    `load_data` es un callable que regresa `(df, new_days)`; en pruebas puede
+    ser cualquier fuente local en lugar de la exportación de Supabase.
+    """
+
+    def __init__(self, load_data=None, cache_dir=DEFAULT_CACHE_DIR, max_batch=MAX_BATCH, max_wait=MAX_WAIT_SECONDS):
+        self.load_data = load_data if load_data is not None else history_source(cache_dir=cache_dir)
+        self.cache_dir = cache_dir
+        # Tipos de cambio para responder en otras monedas (se cargan al primer uso)
+        self.rates = RateTable(cache_dir)
+        self.registry = ModelRegistry()
+        self.batcher = MicroBatcher(self.registry, max_batch, max_wait)
+        self._retrain_lock = threading.Lock()
+        # Telemetría del último reentrenamiento (GET /metrics)
+        self.telemetry = None
+
+    def retrain(self):
+        """Reentrena (o carga de caché) y publica los modelos nuevos sin detener el servicio."""
+        with self._retrain_lock:
+            telemetry = RunTelemetry()
+            with telemetry.stage('carga') as record:
+                df, new_days = self.load_data()
+                record['rows'] = len(df)
+            forecaster, backtest_results, _ = train_models(df, self.cache_dir, new_days, telemetry)
+            version = f"{df['fecha'].max():%Y-%m-%d}:{len(df)}"
+            with telemetry.stage('snapshot'):
+                snapshot = ModelSnapshot(forecaster, backtest_results, version, df['fecha'].min(), df['fecha'].max())
+            telemetry.info['version'] = version
+            self.registry.swap(snapshot)
+            self.telemetry = telemetry
+            return snapshot
+
+    def retrain_async(self):
+        """Lanza un reentrenamiento en segundo plano; regresa False si ya hay uno en curso."""
+        if self._retrain_lock.locked():
+            return False
+        threading.Thread(target=self.retrain, name='forecast-retrain', daemon=True).start()
+        return True
+
+    def forecast(self, start, end, modelo=None, cotizaciones=None, nivel=None, moneda=BASE_CURRENCY,
+                 timeout=REQUEST_TIMEOUT_SECONDS):
+        moneda = moneda.upper()
+        if moneda != BASE_CURRENCY and moneda not in BANXICO_SERIES:
+            raise ValueError(f"Moneda no soportada: {moneda}")
+        fechas = pd.date_range(start, end, freq='D')
+        if len(fechas) == 0:
+            raise ValueError("El rango de fechas está vacío")
+        if len(fechas) > MAX_HORIZON_DAYS:
+            raise ValueError(f"El horizonte máximo es de {MAX_HORIZON_DAYS} días")
+        # Camino rápido: fechas dentro del pronóstico precalculado del snapshot actual
+        snapshot = self.registry.current()
+        predictions = None
+        if nivel is not None:
+            # Con intervalo se predice directo: una pasada por modelo da punto e intervalo
+            if snapshot is None:
+                raise RuntimeError("No hay modelos entrenados todavía")
+            predictions = snapshot.forecaster.forecast_dates(fechas, cotizaciones, snapshot.requested_models(modelo), nivel)
+        elif snapshot is not None and cotizaciones is None:
+            predictions = snapshot.lookup(fechas, modelo)
+        if predictions is None:
+            snapshot, predictions = self.batcher.submit(fechas, cotizaciones, modelo).result(timeout)
+        predictions = convert_forecast(predictions, moneda, self.rates)
+
+        modelo = modelo or snapshot.best_model
+        names = [name for name in predictions.columns if name != 'fecha']
+        fechas_str = pd.DatetimeIndex(predictions['fecha']).strftime('%Y-%m-%d').tolist()
+        if modelo == ALL_MODELS:
+            pronostico = [dict(fecha=f, **row) for f, row in zip(fechas_str, predictions[names].to_dict('records'))]
+        else:
+            pronostico = [{'fecha': f, 'ventas': v} for f, v in zip(fechas_str, predictions[modelo].tolist())]
+            if nivel is not None:
+                lower, upper = interval_columns(modelo)
+                for entry, inferior, superior in zip(pronostico, predictions[lower].tolist(), predictions[upper].tolist()):
+                    entry.update(inferior=inferior, superior=superior)
+        result = {'modelo': modelo, 'version': snapshot.version, 'moneda': moneda, 'pronostico': pronostico}
+        if nivel is not None:
+            result['nivel'] = nivel
+        return result
+
+    def status(self):
+        snapshot = self.registry.current()
+        if snapshot is None:
+            return {'status': 'sin_modelos'}
+        return {
+            'status': 'ok',
+            'version': snapshot.version,
+            'modelo': snapshot.best_model,
+            'entrenado': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(snapshot.trained_at)),
+            'reentrenando': self._retrain_lock.locked(),
+        }
+
+    def models(self):
+        snapshot = self.registry.current()
+        if snapshot is None:
+            return {'modelos': []}
+        return {'version': snapshot.version, 'modelos': snapshot.leaderboard.to_dict('records')}
+
+    def metrics(self):
+        """Telemetría del último reentrenamiento en formato OpenMetrics."""
+        if self.telemetry is None:
+            return '# EOF\n'
+        return self.telemetry.to_openmetrics()
+
+    def make_server(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        handler = type('ForecastHandler', (_ForecastHandler,), {'service': self})
+        return ThreadingHTTPServer((host, port), handler)
+
+    def close(self):
+        self.batcher.close()
+
+
+class _ForecastHandler(BaseHTTPRequestHandler):
+    """Endpoints JSON: GET /health, GET /models, GET|POST /forecast, POST /reload; GET /metrics (OpenMetrics)."""
+
+    protocol_version = 'HTTP/1.1'
+    # Encabezados y cuerpo se escriben por separado; sin esto Nagle + ACK retrasado agregan ~40 ms
+    disable_nagle_algorithm = True
+    service = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, content_type='application/json; charset=utf-8'):
+        body = (payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _params(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = json.loads(self.rfile.read(length))
+            if not isinstance(body, dict):
+                raise ValueError("El cuerpo JSON debe ser un objeto con los parámetros")
+            params.update(body)
+        return url.path.rstrip('/') or '/', params
+
+    def _forecast(self, params):
+        if 'start' not in params:
+            raise ValueError("Falta el parámetro 'start'")
+        cotizaciones = params.get('cotizaciones')
+        nivel = params.get('nivel')
+        return self.service.forecast(
+            params['start'],
+            params.get('end', params['start']),
+            params.get('modelo'),
+            None if cotizaciones is None else float(cotizaciones),
+            None if nivel is None else float(nivel),
+            params.get('moneda', BASE_CURRENCY),
+        )
+
+    def _handle(self, method):
+        try:
+            path, params = self._params()
+            if method == 'GET' and path == '/health':
+                return self._send(200, self.service.status())
+            if method == 'GET' and path == '/models':
+                return self._send(200, self.service.models())
+            if method == 'GET' and path == '/metrics':
+                return self._send(200, self.service.metrics(), 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+            if path == '/forecast':
+                return self._send(200, self._forecast(params))
+            if method == 'POST' and path == '/reload':
+                started = self.service.retrain_async()
+                return self._send(202, {'status': 'reentrenando' if started else 'reentrenamiento_en_curso'})
+            return self._send(404, {'error': f'Ruta no encontrada: {path}'})
+        except (ValueError, KeyError, json.JSONDecodeError) as exc:
+            return self._send(400, {'error': str(exc)})
+        except RuntimeError as exc:
+            return self._send(503, {'error': str(exc)})
+        except Exception as exc:
+            return self._send(500, {'error': f'{type(exc).__name__}: {exc}'})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Servicio local de pronóstico de ventas")
+    parser.add_argument('--source', default=None, help="Exportación de cotizaciones (CSV/JSONL/SQLite); por omisión los datos embebidos")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--estados', default=SALE_STATES, type=parse_estados,
+                        help="Estados de cotización que cuentan como venta, separados por coma ('todos' = sin filtro)")
+    args = parser.parse_args(argv)
+
+    service = ForecastService(history_source(args.source, DEFAULT_CACHE_DIR, args.estados))
+    snapshot = service.retrain()
+    server = service.make_server(args.host, args.port)
+    print(f"Servicio de pronóstico en http://{args.host}:{server.server_port} (modelo {snapshot.best_model}, datos {snapshot.version})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
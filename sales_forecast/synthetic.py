@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from .features import add_calendar_columns
+from .ingestion import DAILY_COLUMNS
+from .sample_data import sales_data
+
+DEFAULT_START = '2000-01-01'
+# Último día representable con datetime64[ns]
+MAX_DATE = pd.Timestamp('2262-04-01')
+
+
+def fit_profile(df=None):
+    """Parámetros de la distribución real de ventas (por omisión, de los datos embebidos).
+
+    - probabilidad de que haya ventas cada día de la semana,
+    - cotizaciones por día (1 + Poisson),
+    - monto por cotización lognormal, con un multiplicador por día de la semana.
+    """
+    if df is None:
+        df = pd.DataFrame(sales_data)
+    df = add_calendar_columns(df.copy())
+    calendar = pd.date_range(df['fecha'].min(), df['fecha'].max(), freq='D')
+    calendar_dow = pd.Series((calendar.dayofweek + 1) % 7).value_counts().reindex(range(7), fill_value=0)
+    sale_dow = df['dia_semana'].value_counts().reindex(range(7), fill_value=0)
+
+    ticket = df['ventas_totales_mxn'] / df['cotizaciones_por_dia'].clip(lower=1)
+    log_ticket = np.log(ticket.clip(lower=1))
+    weekday_log_mean = log_ticket.groupby(df['dia_semana']).mean().reindex(range(7)).fillna(log_ticket.mean())
+    return {
+        'p_sale': (sale_dow / calendar_dow.clip(lower=1)).clip(0.02, 1.0).to_numpy(),
+        'extra_quotes_lambda': max(df['cotizaciones_por_dia'].mean() - 1, 0.0),
+        'log_ticket_mean': float(log_ticket.mean()),
+        'log_ticket_std': float(log_ticket.std(ddof=0)),
+        'weekday_log_offset': (weekday_log_mean - log_ticket.mean()).to_numpy(),
+    }
+
+
+def synthetic_history(n_rows, n_series=1, seed=42, start=DEFAULT_START, profile=None):
+    """Historia diaria sintética con `n_rows` filas repartidas en `n_series` series.
+
+    Cada serie tiene ventas sólo algunos días (como la historia real) y un nivel
+    propio (multiplicador lognormal). Con una sola serie regresa las columnas de
+    `DAILY_COLUMNS`; con varias antepone `serie`. La generación es vectorizada.
+    """
+    profile = profile if profile is not None else fit_profile()
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start)
+    # Filas por serie: el residuo se reparte una fila a cada una de las primeras series
+    rows_target = np.full(n_series, n_rows // n_series) + (np.arange(n_series) < n_rows % n_series)
+    rows_per_series = int(rows_target.max())
+
+    # Días de calendario suficientes para juntar `rows_per_series` días con ventas
+    start_dow = (start.dayofweek + 1) % 7
+    mean_p = profile['p_sale'].mean()
+    n_days = int(rows_per_series / mean_p * 1.3) + 14
+    if start + pd.Timedelta(days=n_days) > MAX_DATE:
+        raise ValueError(f"{rows_per_series} filas por serie no caben en el calendario desde {start.date()}; usa más series")
+
+    dow = (start_dow + np.arange(n_days)) % 7
+    has_sale = rng.random((n_series, n_days)) < profile['p_sale'][dow]
+    # Se garantiza el número de filas pedido marcando días extra al final si hace falta
+    missing = rows_target - has_sale.sum(axis=1)
+    for serie in np.flatnonzero(missing > 0):
+        free = np.flatnonzero(~has_sale[serie])
+        has_sale[serie, free[:missing[serie]]] = True
+    serie_idx, day_idx = np.nonzero(has_sale)
+    rank = np.arange(len(serie_idx)) - np.repeat(np.r_[0, np.cumsum(has_sale.sum(axis=1))[:-1]], has_sale.sum(axis=1))
+    keep = rank < rows_target[serie_idx]
+    serie_idx, day_idx = serie_idx[keep], day_idx[keep]
+
+    n = len(serie_idx)
+    quotes = 1 + rng.poisson(profile['extra_quotes_lambda'], n)
+    serie_level = rng.normal(0.0, 1.0, n_series) if n_series > 1 else np.zeros(1)
+    log_ticket = (profile['log_ticket_mean'] + profile['weekday_log_offset'][dow[day_idx]]
+                  + serie_level[serie_idx] + rng.normal(0.0, profile['log_ticket_std'], n))
+    ventas = np.round(quotes * np.exp(log_ticket), 2)
+
+    history = pd.DataFrame({
+        'fecha': start + pd.to_timedelta(day_idx, unit='D'),
+        'cotizaciones_por_dia': quotes.astype('int64'),
+        'ventas_totales_mxn': ventas,
+    })
+    history = add_calendar_columns(history)[DAILY_COLUMNS]
+    if n_series > 1:
+        history.insert(0, 'serie', np.char.add('S', serie_idx.astype(str)))
+        history = history.sort_values(['serie', 'fecha'], ignore_index=True)
+    return history
+
+
+def synthetic_quotes(history, seed=42):
+    """Cotizaciones individuales (formato de exportación) cuyo total diario reproduce `history`."""
+    rng = np.random.default_rng(seed)
+    counts = history['cotizaciones_por_dia'].to_numpy()
+    day = np.repeat(np.arange(len(history)), counts)
+    # Reparto del total del día entre sus cotizaciones
+    weights = rng.random(len(day)) + 0.1
+    weights /= np.bincount(day, weights)[day]
+    quotes = pd.DataFrame({
+        'cotizacion_id': np.arange(1, len(day) + 1),
+        'fecha_creacion': (history['fecha'].to_numpy()[day] + pd.to_timedelta(rng.integers(9 * 3600, 19 * 3600, len(day)), unit='s')),
+        'total_mxn': np.round(history['ventas_totales_mxn'].to_numpy()[day] * weights, 2),
+        'estado': 'producción',
+    })
+    if 'serie' in history.columns:
+        quotes.insert(1, 'serie', history['serie'].to_numpy()[day])
+    quotes['fecha_creacion'] = quotes['fecha_creacion'].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    return quotes
@@ -0,0 +1,239 @@
+"""Telemetría estructurada de cada corrida del pipeline.
+
+Cada etapa se mide con `RunTelemetry.stage`: tiempo de reloj, tiempo de CPU
+(incluyendo procesos hijos del pool), máximo histórico de memoria residente del
+proceso al terminar la etapa y filas procesadas; el pico de memoria propio de
+cada etapa sale de tracemalloc (`trace_memory`). Los modelos agregan sus
+estadísticas de ajuste con `record_model`. La corrida se exporta como JSON o como
+texto OpenMetrics; el reporte impreso es sólo uno de sus consumidores.
+
+Para cualquier etapa se puede activar cProfile (`profile`) o tracemalloc
+(`trace_memory`) por nombre, o para todas con '*'. Sólo puede haber un cProfile
+activo: una etapa perfilada dentro de otra queda en el perfil de la de afuera.
+"""
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+METRIC_PREFIX = 'sales_forecast'
+PROFILE_TOP_FUNCTIONS = 10
+
+
+def cpu_seconds():
+    """Tiempo de CPU del proceso, incluyendo los procesos hijos ya terminados (pools)."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _rss_high_water_bytes():
+    """Máximo de memoria residente del proceso desde que arrancó (None si la plataforma no lo expone).
+
+    Es acumulado: no baja al terminar una etapa grande, así que no es un pico por etapa.
+    """
+    if not RESOURCE_AVAILABLE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KiB; macOS, bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _stage_names(value):
+    if not value:
+        return frozenset()
+    if isinstance(value, str):
+        value = value.split(',')
+    return frozenset(name.strip() for name in value if name.strip())
+
+
+class RunTelemetry:
+    """Mediciones de una corrida: etapas, modelos e información general."""
+
+    def __init__(self, profile=None, trace_memory=None, profile_dir='.'):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = pd.Timestamp.now().isoformat(timespec='seconds')
+        self.profile = _stage_names(profile)
+        self.trace_memory = _stage_names(trace_memory)
+        self.profile_dir = profile_dir
+        self.stages = []
+        self.models = {}
+        self.info = {}
+        self._open = []
+        # Pico de tracemalloc acumulado de cada etapa trazada abierta (de afuera hacia adentro)
+        self._traced_peaks = []
+        # Etapa cuyo cProfile está activo
+        self._profiling = None
+
+    def _wants(self, names, stage):
+        return '*' in names or stage in names
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Mide el bloque como una etapa; el registro que se entrega admite más campos (p. ej. `rows`)."""
+        record = {'stage': name, 'parent': self._open[-1] if self._open else None, 'rows': rows}
+        profiler = None
+        if self._wants(self.profile, name):
+            if self._profiling is None:
+                profiler = cProfile.Profile()
+            else:
+                record['profiled_in'] = self._profiling
+        tracing = self._wants(self.trace_memory, name)
+        started_tracing = tracing and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif tracing:
+            # reset_peak borra el pico de las etapas abiertas: se guarda antes en ellas
+            self._fold_traced_peak()
+            tracemalloc.reset_peak()
+        if tracing:
+            self._traced_peaks.append(0)
+
+        self._open.append(name)
+        wall_start, cpu_start = time.perf_counter(), cpu_seconds()
+        record['status'] = 'ok'
+        try:
+            if profiler is not None:
+                profiler.enable()
+                self._profiling = name
+            yield record
+        except BaseException:
+            record['status'] = 'error'
+            raise
+        finally:
+            if profiler is not None and self._profiling == name:
+                profiler.disable()
+                self._profiling = None
+            else:
+                profiler = None
+            record['wall_s'] = time.perf_counter() - wall_start
+            record['cpu_s'] = cpu_seconds() - cpu_start
+            record['process_rss_high_water_bytes'] = _rss_high_water_bytes()
+            if tracing:
+                # El pico de esta etapa también cuenta para las etapas trazadas que la contienen
+                self._fold_traced_peak()
+                record['traced_peak_bytes'] = self._traced_peaks.pop()
+                if started_tracing:
+                    tracemalloc.stop()
+            if profiler is not None:
+                record.update(self._dump_profile(name, profiler))
+            self._open.pop()
+            self.stages.append(record)
+
+    def _fold_traced_peak(self):
+        peak = tracemalloc.get_traced_memory()[1]
+        self._traced_peaks = [max(saved, peak) for saved in self._traced_peaks]
+
+    def _dump_profile(self, name, profiler):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f'{self.run_id}-{name}.prof')
+        profiler.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        return {'profile_path': path, 'profile_top': out.getvalue()}
+
+    def record_model(self, name, **stats):
+        """Agrega (o actualiza) estadísticas de un modelo: ajuste, tamaño, métricas de backtest."""
+        self.models.setdefault(name, {}).update(
+            {key: value.item() if hasattr(value, 'item') else value for key, value in stats.items()})
+
+    def stage_summary(self):
+        """Etapas como DataFrame, en el orden en que terminaron."""
+        columns = ['stage', 'parent', 'rows', 'wall_s', 'cpu_s', 'process_rss_high_water_bytes', 'traced_peak_bytes', 'status']
+        return pd.DataFrame(self.stages).reindex(columns=columns)
+
+    def to_dict(self):
+        stages = [{key: value for key, value in record.items() if key != 'profile_top'} for record in self.stages]
+        return {
+            'run_id': self.run_id,
+            'started': self.started,
+            'info': self.info,
+            'stages': stages,
+            'models': self.models,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=_json_default)
+
+    def to_openmetrics(self):
+        """Exposición en formato de texto OpenMetrics (gauges por etapa y por modelo)."""
+        lines = []
+
+        def family(name, help_text, unit, samples, kind='gauge'):
+            samples = [(labels, value) for labels, value in samples if value is not None]
+            if not samples:
+                return
+            metric = f'{METRIC_PREFIX}_{name}'
+            lines.append(f'# TYPE {metric} {kind}')
+            if unit:
+                lines.append(f'# UNIT {metric} {unit}')
+            lines.append(f'# HELP {metric} {help_text}')
+            # Las métricas tipo info llevan el sufijo _info en cada muestra
+            sample_name = f'{metric}_info' if kind == 'info' else metric
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape_label(val)}"' for key, val in labels.items())
+                lines.append(f'{sample_name}{{{label_text}}} {_format_value(value)}')
+
+        run = {'run_id': self.run_id}
+        family('run', "Información de la corrida.", None,
+               [(dict(run, **{key: str(value) for key, value in self.info.items()}), 1)], kind='info')
+        stage_labels = lambda record: dict(run, stage=record['stage'])
+        family('stage_wall_seconds', "Tiempo de reloj de la etapa.", 'seconds',
+               [(stage_labels(r), r['wall_s']) for r in self.stages])
+        family('stage_cpu_seconds', "Tiempo de CPU de la etapa (incluye procesos hijos).", 'seconds',
+               [(stage_labels(r), r['cpu_s']) for r in self.stages])
+        family('stage_rows', "Filas procesadas por la etapa.", None,
+               [(stage_labels(r), r.get('rows')) for r in self.stages])
+        family('stage_process_rss_high_water_bytes',
+               "Máximo histórico de memoria residente del proceso al terminar la etapa (acumulado, no por etapa).", 'bytes',
+               [(stage_labels(r), r.get('process_rss_high_water_bytes')) for r in self.stages])
+        family('stage_traced_peak_bytes', "Pico de memoria trazada por tracemalloc durante la etapa.", 'bytes',
+               [(stage_labels(r), r.get('traced_peak_bytes')) for r in self.stages])
+
+        numeric = sorted({key for stats in self.models.values() for key, value in stats.items()
+                          if isinstance(value, (int, float)) and not isinstance(value, bool)})
+        for key in numeric:
+            family(f'model_{key}', f"Estadística '{key}' del modelo.", 'seconds' if key.endswith('_seconds') else None,
+                   [(dict(run, model=name), stats.get(key)) for name, stats in self.models.items()])
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_openmetrics(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_openmetrics())
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(value)
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return str(value)
@@ -0,0 +1,286 @@
+"""Búsqueda de hiperparámetros con el backtest walk-forward y halving sucesivo.
+
+Se buscan la profundidad, el tamaño de hoja, la fracción de features y el número
+de árboles del random forest, y la regularización de los modelos lineales (Ridge,
+Lasso). Cada familia es una búsqueda independiente:
+
+- Ronda 0: todas las configuraciones se evalúan en unos cuantos orígenes del
+  backtest; pasa sólo la mejor fracción `1/eta`, que se evalúa en `eta` veces más
+  orígenes, y así hasta la última ronda, que usa todos.
+- El bosque de cada configuración crece con `warm_start` (25, 50, 100, 200
+  árboles) y se mide en cada tamaño, sin reentrenar desde cero; los tamaños
+  descartados ya no se cultivan en rondas siguientes.
+- Los pares (configuración, origen) se reparten en un pool de procesos que mapea
+  la historia compartida (ver `columnar.ColumnarHistory`).
+
+La mejor configuración de cada familia se guarda en `tuning.json` dentro de la
+caché y la corrida normal (`pipeline.train_models`) la usa en lugar de la fija:
+
+    python -m sales_forecast.tuning [exportacion.csv] [--jobs 8] [--eta 3]
+"""
+import itertools
+import json
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .backtest import DEFAULT_HORIZONS, rolling_origins
+from .columnar import ColumnarHistory
+from .features import FEATURES
+from .models import (LINEAR, RANDOM_FOREST, SKLEARN_AVAILABLE, make_estimator, mean_absolute_error,
+                     tree_predictions)
+
+TUNING_FORMAT = 1
+TUNING_FILE = 'tuning.json'
+
+# Espacio de búsqueda del random forest; el número de árboles crece con warm_start
+FOREST_SPACE = {
+    'max_depth': [None, 4, 8, 16],
+    'min_samples_leaf': [1, 3, 8],
+    'max_features': [1.0, 0.5, 'sqrt'],
+}
+TREE_COUNTS = (25, 50, 100, 200)
+# Modelos lineales: sin regularización, Ridge (L2) y Lasso (L1)
+LINEAR_SPACE = (
+    [('LinearRegression', {})]
+    + [('Ridge', {'alpha': alpha}) for alpha in (0.1, 1.0, 10.0, 100.0, 1000.0)]
+    + [('Lasso', {'alpha': alpha, 'max_iter': 10000}) for alpha in (1.0, 10.0, 100.0, 1000.0, 10000.0)]
+)
+DEFAULT_ETA = 3
+# Orígenes mínimos de la primera ronda
+MIN_RUNG_ORIGINS = 3
+
+SEARCH_COLUMNS = ['familia', 'candidato', 'estimador', 'params', 'arboles', 'ronda', 'origenes', 'mae']
+
+# Estado de cada proceso del pool: se recibe una sola vez en el inicializador
+_worker_state = {}
+
+
+def search_spaces():
+    """Candidatos por familia: `{familia: [(estimador, params, conteos_de_árboles)]}`."""
+    if not SKLEARN_AVAILABLE:
+        return {}
+    forests = [('RandomForestRegressor', dict(zip(FOREST_SPACE, values)), TREE_COUNTS)
+               for values in itertools.product(*FOREST_SPACE.values())]
+    linear = [(estimador, params, None) for estimador, params in LINEAR_SPACE]
+    return {LINEAR: linear, RANDOM_FOREST: forests}
+
+
+def rung_origins(origins, eta, n_units):
+    """Orígenes acumulados de cada ronda: subconjuntos anidados y espaciados de `origins`.
+
+    Hay tantas rondas como veces se puede dividir `n_units` entre `eta`, sin que la
+    primera quede con menos de `MIN_RUNG_ORIGINS` orígenes; la última usa todos.
+    """
+    n_rungs = 1
+    while (eta ** n_rungs < n_units and len(origins) / eta ** n_rungs >= MIN_RUNG_ORIGINS):
+        n_rungs += 1
+    # Con pasos potencia de eta cada ronda contiene a la anterior
+    return [origins[::eta ** (n_rungs - 1 - rung)] for rung in range(n_rungs)]
+
+
+def _init_worker(X, y, horizons):
+    _worker_state.update(X=X, y=y, horizons=horizons)
+
+
+def _init_shared_worker(history_dir, horizons):
+    frame = ColumnarHistory(history_dir).open()
+    _init_worker(frame[FEATURES], frame['ventas_totales_mxn'], horizons)
+
+
+def _fold_errors(predicted, actual, horizons):
+    """MAE de cada horizonte que cabe en el pliegue (las mismas filas que `run_backtest`)."""
+    return [(horizon, float(mean_absolute_error(actual[:horizon], predicted[:horizon]))) for horizon in horizons
+            if horizon <= len(actual)]
+
+
+def _evaluate(task):
+    """MAE de un candidato en un origen, por cada número de árboles que sigue vivo (0 sin árboles)."""
+    candidate, estimador, params, tree_counts, origin = task
+    X, y, horizons = _worker_state['X'], _worker_state['y'], _worker_state['horizons']
+    X_train, y_train = X[:origin], y[:origin]
+    X_test = X[origin:origin + max(horizons)]
+    actual = y[origin:origin + max(horizons)].to_numpy()
+    if not tree_counts:
+        predicted = make_estimator(estimador, params).fit(X_train, y_train).predict(X_test)
+        return [(candidate, 0, origin, horizon, mae) for horizon, mae in _fold_errors(predicted, actual, horizons)]
+
+    # El bosque crece con warm_start: cada fit sólo entrena los árboles nuevos y la
+    # suma de predicciones se actualiza con ellos
+    forest = make_estimator(estimador, dict(params, warm_start=True))
+    total = np.zeros(len(X_test))
+    rows = []
+    for n_trees in tree_counts:
+        grown = len(getattr(forest, 'estimators_', []))
+        forest.set_params(n_estimators=n_trees).fit(X_train, y_train)
+        total += tree_predictions(forest, X_test, start=grown).sum(axis=0)
+        rows.extend((candidate, n_trees, origin, horizon, mae)
+                    for horizon, mae in _fold_errors(total / n_trees, actual, horizons))
+    return rows
+
+
+def successive_halving(candidates, origins, evaluate, eta=DEFAULT_ETA, familia=None, log=print):
+    """Halving sucesivo sobre orígenes del backtest para una familia de candidatos.
+
+    La unidad que compite es el par (candidato, número de árboles); un candidato
+    sigue vivo mientras alguno de sus tamaños lo esté. `evaluate(tasks)` evalúa
+    una lista de tareas `(candidato, estimador, params, árboles, origen)` y regresa
+    las filas `(candidato, árboles, origen, horizonte, mae)`; el MAE de cada unidad
+    es el promedio de sus filas, como en `leaderboard`.
+    """
+    # Unidades vivas: (candidato, árboles), con 0 para los modelos sin árboles
+    alive = {(index, n_trees) for index, (_, _, tree_counts) in enumerate(candidates) for n_trees in tree_counts or (0,)}
+    rungs = rung_origins(origins, eta, len(alive))
+    rows, history, evaluated = [], [], set()
+    for rung, rung_set in enumerate(rungs):
+        started = time.perf_counter()
+        new_origins = [origin for origin in rung_set if origin not in evaluated]
+        counts = {}
+        for index, n_trees in sorted(alive):
+            counts.setdefault(index, []).append(n_trees)
+        tasks = [(index, candidates[index][0], candidates[index][1], tuple(n for n in trees if n), origin)
+                 for index, trees in counts.items() for origin in new_origins]
+        rows.extend(evaluate(tasks))
+        evaluated.update(new_origins)
+
+        # MAE acumulado de cada unidad viva sobre todos los orígenes de la ronda
+        frame = pd.DataFrame(rows, columns=['candidato', 'arboles', 'origen', 'horizonte', 'mae'])
+        frame = frame[frame['origen'].isin(rung_set)]
+        units = pd.MultiIndex.from_frame(frame[['candidato', 'arboles']])
+        scores = frame[units.isin(list(alive))].groupby(['candidato', 'arboles'])['mae'].mean().reset_index()
+        for row in scores.itertuples():
+            estimador, params, _ = candidates[row.candidato]
+            history.append((familia, row.candidato, estimador, params, row.arboles or None, rung, len(rung_set), row.mae))
+
+        keep = len(scores) if rung == len(rungs) - 1 else max(1, math.ceil(len(scores) / eta))
+        kept = scores.sort_values(['mae', 'candidato', 'arboles']).head(keep)
+        alive = set(zip(kept['candidato'], kept['arboles']))
+        log(f"{familia} ronda {rung}: {len(scores)} candidatos x {len(rung_set)} orígenes, "
+            f"pasan {len(kept)} ({time.perf_counter() - started:.1f} s)")
+    return pd.DataFrame(history, columns=SEARCH_COLUMNS)
+
+
+def tune(df_model, horizons=DEFAULT_HORIZONS, min_train=None, step=1, eta=DEFAULT_ETA, n_jobs=None, spaces=None,
+         log=print):
+    """Busca la mejor configuración de cada familia con el backtest de `df_model`.
+
+    Usa los mismos orígenes que `run_backtest`; el MAE de la última ronda es el
+    del backtest completo. Regresa `(best, history)`: la mejor configuración por
+    familia (`{familia: {'estimador', 'params', 'mae'}}`) y todas las
+    evaluaciones por ronda.
+    """
+    spaces = spaces if spaces is not None else search_spaces()
+    horizons = tuple(sorted(horizons))
+    n_rows = len(df_model)
+    if min_train is None:
+        min_train = max(10, n_rows // 2)
+    origins = rolling_origins(n_rows, min_train, horizons[0], step)
+    if not origins:
+        raise ValueError(f"Historia insuficiente para la búsqueda: {n_rows} filas, min_train={min_train}")
+
+    X = df_model[FEATURES].reset_index(drop=True)
+    y = df_model['ventas_totales_mxn'].reset_index(drop=True)
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    def search(evaluate):
+        return pd.concat([successive_halving(candidates, origins, evaluate, eta, familia, log)
+                          for familia, candidates in spaces.items()], ignore_index=True)
+
+    if n_jobs == 1:
+        _init_worker(X, y, horizons)
+        history = search(lambda tasks: [row for task in tasks for row in _evaluate(task)])
+    else:
+        with tempfile.TemporaryDirectory(prefix='tuning-') as shared_dir:
+            ColumnarHistory(shared_dir).write(X.assign(ventas_totales_mxn=y), 'tuning')
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_shared_worker,
+                                     initargs=(shared_dir, horizons)) as pool:
+                def evaluate(tasks):
+                    chunksize = max(1, len(tasks) // (4 * n_jobs))
+                    return [row for rows in pool.map(_evaluate, tasks, chunksize=chunksize) for row in rows]
+                history = search(evaluate)
+
+    best = {}
+    final = history[history['ronda'] == history.groupby('familia')['ronda'].transform('max')]
+    for familia, rows in final.groupby('familia', sort=False):
+        row = rows.sort_values('mae').iloc[0]
+        params = dict(row['params'])
+        if not pd.isna(row['arboles']):
+            params['n_estimators'] = int(row['arboles'])
+        best[familia] = {'estimador': row['estimador'], 'params': params, 'mae': float(row['mae'])}
+    return best, history
+
+
+def tuning_path(cache_dir):
+    return os.path.join(cache_dir, TUNING_FILE)
+
+
+def save_best(cache_dir, best, df_model):
+    """Guarda la mejor configuración por familia en `tuning.json` (escritura atómica)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    payload = {
+        'format': TUNING_FORMAT,
+        'fecha': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'filas': len(df_model),
+        'ultima_fecha': f"{df_model['fecha'].max():%Y-%m-%d}",
+        'modelos': best,
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, tuning_path(cache_dir))
+
+
+def load_best(cache_dir):
+    """Mejor configuración guardada (`{familia: {'estimador', 'params', ...}}`) o None."""
+    path = tuning_path(cache_dir)
+    if not SKLEARN_AVAILABLE or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        payload = json.load(f)
+    return payload['modelos'] if payload.get('format') == TUNING_FORMAT else None
+
+
+def main(argv=None):
+    import argparse
+    import warnings
+
+    from .features import add_features
+    from .ingestion import SALE_STATES, parse_estados
+    from .pipeline import DEFAULT_CACHE_DIR, load_history
+
+    parser = argparse.ArgumentParser(description="Búsqueda de hiperparámetros con halving sucesivo")
+    parser.add_argument('source', nargs='?', default=None, help="Exportación de cotizaciones (CSV/JSONL/SQLite); por omisión los datos embebidos")
+    parser.add_argument('--jobs', type=int, default=None, help="Procesos del pool (por omisión todos los núcleos)")
+    parser.add_argument('--eta', type=int, default=DEFAULT_ETA, help="Factor de reducción entre rondas")
+    parser.add_argument('--step', type=int, default=1, help="Paso entre orígenes del backtest")
+    parser.add_argument('--dry-run', action='store_true', help="No guarda la mejor configuración")
+    parser.add_argument('--estados', default=SALE_STATES, type=parse_estados,
+                        help="Estados de cotización que cuentan como venta, separados por coma ('todos' = sin filtro)")
+    args = parser.parse_args(argv)
+
+    if not SKLEARN_AVAILABLE:
+        print("Sklearn no disponible - no hay hiperparámetros que buscar")
+        return
+    # Lasso sin convergencia en configuraciones malas: se descartan por MAE, no por aviso
+    warnings.filterwarnings('ignore')
+    df, _, _ = load_history(args.source, DEFAULT_CACHE_DIR, estados=args.estados)
+    df_model = add_features(df)
+    started = time.perf_counter()
+    best, history = tune(df_model, step=args.step, eta=args.eta, n_jobs=args.jobs)
+    print(f"\nBúsqueda completa en {time.perf_counter() - started:.1f} s")
+
+    print("\nFamilia           | Estimador              | MAE          | Hiperparámetros")
+    for familia, config in best.items():
+        print(f"{familia:17} | {config['estimador']:22} | ${config['mae']:10,.0f} | {config['params']}")
+    if not args.dry_run:
+        save_best(DEFAULT_CACHE_DIR, best, df_model)
+        print(f"\nMejor configuración guardada en {tuning_path(DEFAULT_CACHE_DIR)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from sales_forecast.aggregates import SalesAggregates
+from sales_forecast.synthetic import synthetic_history
+
+DAILY = ['fecha', 'cotizaciones_por_dia', 'ventas_totales_mxn']
+
+
+@pytest.fixture
+def history():
+    return synthetic_history(200)[DAILY]
+
+
+def assert_same_reports(state, expected):
+    """Los reportes del estado incremental coinciden con los de una reconstrucción."""
+    assert state.first_date == expected.first_date
+    assert state.last_date == expected.last_date
+    assert state.cum_dias == expected.cum_dias
+    assert state.cum_cotizaciones == expected.cum_cotizaciones
+    assert state.cum_ventas == pytest.approx(expected.cum_ventas)
+    pdt.assert_frame_equal(state.monthly_report(), expected.monthly_report())
+    pdt.assert_frame_equal(state.weekday_report(), expected.weekday_report())
+    for q in (0.1, 0.5, 0.9):
+        assert state.quantile(q) == pytest.approx(expected.quantile(q))
+    mitad = expected.first_date + (expected.last_date - expected.first_date) / 2
+    assert state.quantile(0.5, mitad) == pytest.approx(expected.quantile(0.5, mitad))
+    assert state.range_summary(mitad) == pytest.approx(expected.range_summary(mitad), nan_ok=True)
+
+
+def _forbid_rebuild(monkeypatch):
+    def rebuild(*args, **kwargs):
+        raise AssertionError("sync reconstruyó el estado en lugar de aplicar los deltas")
+    monkeypatch.setattr(SalesAggregates, 'from_history', rebuild)
+
+
+def test_sync_appends_new_days(history, tmp_path, monkeypatch):
+    path = str(tmp_path / 'aggregates.json')
+    SalesAggregates.sync(path, history.iloc[:150], 'v1')
+    expected = SalesAggregates.from_history(history)
+
+    _forbid_rebuild(monkeypatch)
+    state = SalesAggregates.sync(path, history, 'v2', history.iloc[150:], base_version='v1')
+    assert state.version == 'v2'
+    assert_same_reports(state, expected)
+    assert_same_reports(SalesAggregates.load(path), expected)
+
+
+def test_sync_applies_increments_to_existing_days(history, tmp_path, monkeypatch):
+    path = str(tmp_path / 'aggregates.json')
+    SalesAggregates.sync(path, history, 'v1')
+
+    # Cotizaciones nuevas de días ya registrados (p. ej. el último día, aún abierto)
+    deltas = history.iloc[[50, -1]].assign(cotizaciones_por_dia=1, ventas_totales_mxn=1234.5)
+    updated = history.copy()
+    updated.loc[deltas.index, 'cotizaciones_por_dia'] += 1
+    updated.loc[deltas.index, 'ventas_totales_mxn'] += 1234.5
+    expected = SalesAggregates.from_history(updated)
+
+    _forbid_rebuild(monkeypatch)
+    state = SalesAggregates.sync(path, updated, 'v2', deltas, base_version='v1')
+    assert_same_reports(state, expected)
+
+
+def test_sync_rebuilds_when_deltas_precede_origin(history, tmp_path):
+    path = str(tmp_path / 'aggregates.json')
+    SalesAggregates.sync(path, history.iloc[10:], 'v1')
+
+    state = SalesAggregates.sync(path, history, 'v2', history.iloc[:10], base_version='v1')
+    assert_same_reports(state, SalesAggregates.from_history(history))
+
+
+def test_sync_rebuilds_when_base_version_differs(history, tmp_path):
+    path = str(tmp_path / 'aggregates.json')
+    SalesAggregates.sync(path, history.iloc[:150], 'v1')
+
+    # Deltas incompletos con otra base: se ignoran y se reconstruye desde la historia
+    state = SalesAggregates.sync(path, history, 'v3', history.iloc[190:], base_version='v2')
+    assert_same_reports(state, SalesAggregates.from_history(history))
+
+
+def test_sync_reuses_current_version(history, tmp_path, monkeypatch):
+    path = str(tmp_path / 'aggregates.json')
+    SalesAggregates.sync(path, history, 'v1')
+    expected = SalesAggregates.from_history(history)
+
+    _forbid_rebuild(monkeypatch)
+    state = SalesAggregates.sync(path, history.iloc[:0], 'v1')
+    assert_same_reports(state, expected)
+
+
+def test_empty_state():
+    state = SalesAggregates.from_history(pd.DataFrame({column: [] for column in DAILY}))
+    assert state.first_date is None and state.last_date is None
+    assert state.range_summary()['dias'] == 0
+    assert state.monthly_report().empty
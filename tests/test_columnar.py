@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from sales_forecast.columnar import ColumnarHistory, compact_history
+from sales_forecast.features import add_calendar_columns
+from sales_forecast.synthetic import synthetic_history
+
+
+def _loaded(df):
+    """Copia en memoria: los arreglos mapeados (np.memmap) no pasan assert_frame_equal."""
+    data = {}
+    for name, column in df.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            data[name] = pd.Categorical.from_codes(np.array(column.cat.codes), dtype=column.dtype)
+        else:
+            data[name] = np.array(column)
+    return pd.DataFrame(data)
+
+
+def _panel():
+    history = synthetic_history(300, n_series=3)
+    return history[['serie'] + [column for column in history.columns if column != 'serie']]
+
+
+def test_round_trip_keeps_values_and_dtypes(tmp_path):
+    df = compact_history(_panel())
+    columnar = ColumnarHistory(str(tmp_path / 'history'))
+    columnar.write(df, 'v1')
+
+    opened = columnar.open()
+    assert columnar.version() == 'v1'
+    pdt.assert_frame_equal(_loaded(opened), df)
+    assert isinstance(opened['serie'].dtype, pd.CategoricalDtype)
+    assert opened['dia_semana'].dtype == 'int8'
+    # Las columnas quedan respaldadas por los archivos, no copiadas
+    assert isinstance(opened['fecha'].array._ndarray.base, np.memmap)
+
+
+def test_amounts_keep_float64_when_float32_loses_cents(tmp_path):
+    df = add_calendar_columns(pd.DataFrame({
+        'fecha': pd.date_range('2025-01-01', periods=3),
+        'cotizaciones_por_dia': [1, 2, 3],
+        'ventas_totales_mxn': [123456789.01, 0.01, 250.5],
+    }))
+    df = compact_history(df)
+    assert df['ventas_totales_mxn'].dtype == 'float64'
+
+    columnar = ColumnarHistory(str(tmp_path / 'history'))
+    columnar.write(df, 'v1')
+    pdt.assert_frame_equal(_loaded(columnar.open()), df)
+
+
+def test_rewrite_replaces_generation(tmp_path):
+    directory = tmp_path / 'history'
+    columnar = ColumnarHistory(str(directory))
+    first = compact_history(_panel())
+    columnar.write(first, 'v1')
+    opened = columnar.open()
+
+    second = compact_history(_panel().iloc[:100].copy())
+    columnar.write(second, 'v2')
+    assert columnar.version() == 'v2'
+    pdt.assert_frame_equal(_loaded(columnar.open()), second)
+    # Sólo queda la generación nueva; lo ya abierto sigue siendo legible
+    assert len([name for name in os.listdir(directory) if (directory / name).is_dir()]) == 1
+    pdt.assert_frame_equal(_loaded(opened), first)
+
+
+def test_missing_or_other_format_is_empty(tmp_path):
+    columnar = ColumnarHistory(str(tmp_path / 'history'))
+    assert columnar.open() is None and columnar.version() is None
+
+    columnar.write(compact_history(_panel()), 'v1')
+    with open(columnar.pointer_path) as f:
+        current = json.load(f)
+    current['format'] += 1
+    with open(columnar.pointer_path, 'w') as f:
+        json.dump(current, f)
+    assert columnar.open() is None and columnar.version() is None